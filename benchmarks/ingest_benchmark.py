@@ -0,0 +1,181 @@
+"""
+Ingest throughput benchmark: NextcloudFetcherThread against a local WebDAV stand-in.
+
+Fills the stand-in with N screenshots plus sidecars, runs the fetcher with a stub
+PrintManager and reports files/sec, p50/p99 time from upload to add_new_job and the
+bytes written locally (images, thumbnails).
+
+Run from the repository root:
+    python -m benchmarks.ingest_benchmark --files 200 --latency 20 --bandwidth 2000
+    python -m benchmarks.ingest_benchmark --backend async --connections 2 --pipeline-depth 8
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from benchmarks.webdav_standin import WebDavStandIn
+from src.Ingestor import Ingestor
+from src.image.ThumbnailCache import ThumbnailCache
+from src.threads.NextcloudFetcherThread import NextcloudFetcherThread
+
+IMAGES_FOLDER = "/screenshots"
+METADATA_FOLDER = "/metadata"
+
+
+class StubPrintManager:
+    """The parts of PrintManager the fetcher and Ingestor use; records when jobs arrive."""
+
+    def __init__(self, config, thumbnails: bool):
+        self.config = config
+        self.app = SimpleNamespace(logger=logging.getLogger("benchmark"))
+        self.thumbnails = ThumbnailCache("downloads/thumbnails") if thumbnails else SimpleNamespace(generate=lambda path: None)
+        self.ingestor = Ingestor(self)
+        self.arrivals: dict[str, float] = {}
+        self.done = threading.Event()
+        self.expected = 0
+
+    def add_new_job(self, job):
+        self.arrivals[job.metadata.get("plotId")] = time.perf_counter()
+        if len(self.arrivals) >= self.expected: self.done.set()
+
+    def log(self, message: str):
+        self.app.logger.debug(message)
+
+
+def make_screenshots(count: int, size: tuple[int, int], seed: int = 1) -> list[bytes]:
+    """Screenshot-like PNGs: a shared background with a distinct block per image."""
+    rnd = random.Random(seed)
+    base = Image.new("RGB", size)
+    draw = ImageDraw.Draw(base)
+    for _ in range(40):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        draw.rectangle((x, y, x + rnd.randrange(20, 200), y + rnd.randrange(20, 120)),
+                       fill=(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+
+    screenshots = []
+    for i in range(count):
+        image = base.copy()
+        ImageDraw.Draw(image).rectangle((10, 10, 110, 60), fill=(i % 256, (i // 256) % 256, 200))
+        ImageDraw.Draw(image).text((20, 25), f"plot {i}", fill=(255, 255, 255))
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        screenshots.append(buf.getvalue())
+    return screenshots
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    if not values: return float("nan")
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def folder_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run(args) -> dict:
+    screenshots = make_screenshots(args.files, (args.width, args.height))
+    server = WebDavStandIn(latency=args.latency / 1000, bandwidth=int(args.bandwidth * 1024)).start()
+    server.folders.update({IMAGES_FOLDER + "/", METADATA_FOLDER + "/"})
+
+    config = SimpleNamespace(
+        nc_username="bench", nc_password="bench", nc_url=server.url, nc_backend=args.backend,
+        nc_images_folder=IMAGES_FOLDER, nc_metadata_folder=METADATA_FOLDER,
+        nc_check_time_min=args.poll, nc_check_time_max=args.poll,
+        nc_download_workers=args.workers, nc_connections=args.connections, nc_pipeline_depth=args.pipeline_depth,
+        ingest_decode_workers=args.decode_workers, ingest_queue_size=args.queue_size,
+        ingest_dedupe=True, ingest_dedupe_window=600, ingest_dedupe_perceptual=False, ingest_dedupe_distance=4,
+    )
+    pm = StubPrintManager(config, thumbnails=not args.no_thumbnails)
+    pm.expected = args.files
+
+    uploads: dict[str, float] = {}
+
+    def upload():
+        interval = 1 / args.rate if args.rate else 0
+        for i, data in enumerate(screenshots):
+            name = f"{i:06d}"
+            server.put(f"{METADATA_FOLDER}/{name}.json", json.dumps({"pcName": "bench", "plotId": name}).encode())
+            server.put(f"{IMAGES_FOLDER}/{name}.png", data, mtime=time.time() + i / 1000)
+            uploads[name] = time.perf_counter()
+            if interval: time.sleep(interval)
+
+    fetcher = NextcloudFetcherThread(pm)
+    fetcher.daemon = True
+    start = time.perf_counter()
+    uploader = threading.Thread(target=upload, daemon=True)
+    uploader.start()
+    fetcher.start()
+
+    completed = pm.done.wait(args.timeout)
+    elapsed = max(pm.arrivals.values(), default=time.perf_counter()) - start
+    uploader.join()
+    fetcher.stop()
+    server.stop()
+
+    latencies = [pm.arrivals[name] - uploads[name] for name in pm.arrivals if name in uploads]
+    return {
+        "backend": args.backend,
+        "files": args.files,
+        "ingested": len(pm.arrivals),
+        "completed": completed,
+        "seconds": round(elapsed, 3),
+        "files_per_sec": round(len(pm.arrivals) / elapsed, 2) if elapsed > 0 else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "bytes_uploaded": sum(len(s) for s in screenshots),
+        "bytes_written": folder_size("downloads"),
+        "connections": server.connections,
+        "requests": server.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--latency", type=float, default=10, help="per request, in ms")
+    parser.add_argument("--bandwidth", type=float, default=0, help="per connection, in KiB/s (0 = unlimited)")
+    parser.add_argument("--rate", type=float, default=0, help="uploads per second (0 = all at once)")
+    parser.add_argument("--backend", choices=("owncloud", "async"), default="owncloud")
+    parser.add_argument("--workers", type=int, default=4, help="download workers")
+    parser.add_argument("--decode-workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--connections", type=int, default=2, help="async backend only")
+    parser.add_argument("--pipeline-depth", type=int, default=8, help="async backend only")
+    parser.add_argument("--poll", type=float, default=0.5, help="polling interval in s")
+    parser.add_argument("--no-thumbnails", action="store_true")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix="ingest-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        result = run(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
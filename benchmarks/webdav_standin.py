@@ -0,0 +1,145 @@
+"""
+Minimal Nextcloud/WebDAV stand-in for offline tests and benchmarks.
+
+Serves PROPFIND (depth 0/1, getetag, getlastmodified, getcontentlength), GET,
+DELETE and MKCOL below /remote.php/dav/files/<user>/ plus the OCS capabilities
+endpoint pyocclient queries on login. Connections are HTTP/1.1 keep-alive and
+accept pipelined requests. Every request waits `latency` seconds, bodies are sent
+at `bandwidth` bytes per second (0 = unlimited).
+"""
+import hashlib
+import posixpath
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+
+DAV_PREFIX = "/remote.php/dav/files/"
+CAPABILITIES = (b'<?xml version="1.0"?><ocs><meta><status>ok</status><statuscode>100</statuscode></meta>'
+                b'<data><version><string>27.0.0</string><edition></edition></version>'
+                b'<capabilities><core><pollinterval>60</pollinterval></core></capabilities></data></ocs>')
+
+
+class WebDavStandIn:
+    def __init__(self, latency: float = 0.0, bandwidth: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.files: dict[str, tuple[bytes, float]] = {}   # path → (data, mtime)
+        self.folders: set[str] = {"/"}
+        self.lock = threading.Lock()
+        self.requests: dict[str, int] = {}
+        self.connections = 0
+
+        handler = type("Handler", (_Handler,), {"store": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="WebDavStandIn", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "WebDavStandIn":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def put(self, path: str, data: bytes, mtime: float | None = None):
+        with self.lock:
+            self.folders.add(posixpath.dirname(path).rstrip("/") + "/")
+            self.files[path] = (data, time.time() if mtime is None else mtime)
+
+    def count(self, folder: str) -> int:
+        folder = folder.rstrip("/") + "/"
+        with self.lock:
+            return sum(1 for path in self.files if path.startswith(folder))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: WebDavStandIn
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.store.lock: self.store.connections += 1
+
+    def _begin(self) -> str:
+        length = int(self.headers.get("Content-Length", 0))
+        if length: self.rfile.read(length)
+        with self.store.lock:
+            self.store.requests[self.command] = self.store.requests.get(self.command, 0) + 1
+        if self.store.latency: time.sleep(self.store.latency)
+
+        path = unquote(urlparse(self.path).path)
+        if not path.startswith(DAV_PREFIX): return path
+        user_root = path.find("/", len(DAV_PREFIX))
+        return "/" if user_root < 0 else path[user_root:] or "/"
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/octet-stream"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not self.store.bandwidth:
+            self.wfile.write(body)
+            return
+        chunk = max(1024, self.store.bandwidth // 20)
+        for offset in range(0, len(body), chunk):
+            self.wfile.write(body[offset:offset + chunk])
+            time.sleep(len(body[offset:offset + chunk]) / self.store.bandwidth)
+
+    def do_GET(self):
+        path = self._begin()
+        if path.startswith("/ocs/"): return self._send(200, CAPABILITIES, "text/xml")
+        with self.store.lock: entry = self.store.files.get(path)
+        if entry is None: return self._send(404)
+        self._send(200, entry[0])
+
+    def do_DELETE(self):
+        path = self._begin()
+        with self.store.lock: found = self.store.files.pop(path, None) is not None
+        self._send(204 if found else 404)
+
+    def do_MKCOL(self):
+        path = self._begin().rstrip("/") + "/"
+        with self.store.lock:
+            if path in self.store.folders: return self._send(405)
+            self.store.folders.add(path)
+        self._send(201)
+
+    def do_PROPFIND(self):
+        path = self._begin()
+        folder = path.rstrip("/") + "/"
+        with self.store.lock:
+            if path in self.store.files:
+                entries = [(path, self.store.files[path])]
+            elif folder in self.store.folders:
+                entries = [(folder, None)]
+                if self.headers.get("Depth", "1") != "0":
+                    entries += [(p, f) for p, f in self.store.files.items() if posixpath.dirname(p) + "/" == folder]
+            else:
+                return self._send(404)
+            folder_etag = hashlib.md5("\n".join(sorted(p for p in self.store.files if p.startswith(folder))).encode()).hexdigest()
+
+        user = unquote(urlparse(self.path).path)[len(DAV_PREFIX):].split("/")[0]
+        out = ['<?xml version="1.0"?><d:multistatus xmlns:d="DAV:">']
+        for entry_path, entry in entries:
+            if entry is None:
+                props = f'<d:getetag>"{folder_etag}"</d:getetag><d:resourcetype><d:collection/></d:resourcetype>'
+            else:
+                data, mtime = entry
+                props = (f'<d:getetag>"{hashlib.md5(data).hexdigest()}"</d:getetag>'
+                         f'<d:getlastmodified>{formatdate(mtime, usegmt=True)}</d:getlastmodified>'
+                         f'<d:getcontentlength>{len(data)}</d:getcontentlength><d:resourcetype/>')
+            out.append(f'<d:response><d:href>{DAV_PREFIX}{user}{quote(entry_path)}</d:href>'
+                       f'<d:propstat><d:prop>{props}</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>')
+        out.append("</d:multistatus>")
+        self._send(207, "".join(out).encode("utf-8"), "application/xml; charset=utf-8")
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterator, Mapping
+
+
+@dataclass
+class Delta:
+    """A change of a single job in a list channel (queue, unlisted)."""
+    channel: str
+    type: str                   # add | remove | move | update
+    uuid: str
+    index: int | None = None    # Target position for add and move
+    job: str | None = None      # PrintJob.to_json() for add and update
+
+    def to_json(self, seq: int) -> str:
+        fields = {"type": self.type, "seq": seq, "uuid": self.uuid}
+        if self.index is not None: fields["index"] = self.index
+        data = json.dumps(fields)
+        return data if self.job is None else data[:-1] + ', "job": ' + self.job + "}"
+
+
+class Broadcaster:
+    """
+    Versioned change notification between the PrintManager and the SSE streams.
+    Every publish() bumps a global version and stamps it on the changed channels;
+    streams block in wait() until one of their channels has a newer version.
+    """
+    CURRENT_JOB = "current_job"
+    PROGRESS = "progress"
+    STATUS = "status"
+    QUEUE = "queue"
+    UNLISTED = "unlisted"
+    CHANNELS = (CURRENT_JOB, PROGRESS, STATUS, QUEUE, UNLISTED)
+    # Channels multiplex() streams as a snapshot followed by deltas
+    LIST_CHANNELS = (QUEUE, UNLISTED)
+    # Deltas kept per list channel for clients catching up
+    DELTA_LOG = 256
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.version = 0
+        # Prefix of the SSE event ids, so ids from before a restart are not resumed
+        self.epoch = format(time.time_ns(), "x")
+        self.versions: dict[str, int] = {}   # channel → version of the last change
+        self.deltas: dict[str, deque[tuple[int, str]]] = {c: deque(maxlen=self.DELTA_LOG) for c in self.LIST_CHANNELS}
+        self.trimmed: dict[str, int] = {}    # list channel → newest version no longer in its delta log
+
+    def publish(self, *channels: str):
+        """Change without deltas; clients of a list channel get a new snapshot."""
+        with self.condition:
+            self.version += 1
+            for channel in channels:
+                self.versions[channel] = self.version
+                if channel in self.deltas:
+                    self.deltas[channel].clear()
+                    self.trimmed[channel] = self.version
+            self.condition.notify_all()
+
+    def publish_deltas(self, *deltas: Delta):
+        """Publishes the deltas under one version, in order."""
+        with self.condition:
+            self.version += 1
+            for delta in deltas:
+                log = self.deltas[delta.channel]
+                if len(log) == log.maxlen: self.trimmed[delta.channel] = log[0][0]
+                log.append((self.version, delta.to_json(self.version)))
+                self.versions[delta.channel] = self.version
+            self.condition.notify_all()
+
+    def _deltas_since(self, channel: str, seen: int) -> list[str] | None:
+        """Deltas of channel after version seen, None if they are no longer complete."""
+        if self.trimmed.get(channel, 0) > seen: return None
+        return [data for version, data in self.deltas[channel] if version > seen]
+
+    def wait(self, channels: tuple[str, ...], seen: int, timeout: float | None = None) -> int:
+        """
+        Blocks until one of channels changed after version seen or the timeout passed.
+        :return: The current version (equals seen on timeout)
+        """
+        with self.condition:
+            changed = self.condition.wait_for(lambda: any(self.versions.get(c, 0) > seen for c in channels), timeout)
+            return self.version if changed else seen
+
+    def stream(self, channels: tuple[str, ...], render: Callable[[], str], keepalive: float = 15) -> Iterator[str]:
+        """
+        SSE generator: sends render() on connect and after every change of channels
+        (only if the payload differs), and a comment line every keepalive seconds.
+        """
+        seen = self.version
+        last_sent = render()
+        yield f"data: {last_sent}\n\n"
+        while True:
+            version = self.wait(channels, seen, keepalive)
+            if version == seen:
+                yield ": keep-alive\n\n"
+                continue
+            seen = version
+            payload = render()
+            if payload != last_sent:
+                yield f"data: {payload}\n\n"
+                last_sent = payload
+
+    def multiplex(self, renderers: Mapping[str, Callable[[], str]], last_event_id: str | None = None,
+                  keepalive: float = 15) -> Iterator[str]:
+        """
+        One SSE stream for several channels: each change is sent as a named event
+        (event: <channel>) with "<epoch>.<version>" as id. A client resuming with
+        Last-Event-ID only receives the channels that changed since then; an unknown id
+        (e.g. from before a server restart) gets the full state.
+        List channels send {"type": "snapshot", "seq", "jobs"} with the rendered list
+        first and afterward only their deltas (add, remove, move, update by uuid).
+        """
+        channels = tuple(renderers)
+        last_sent: dict[str, str] = {}
+        seen = self._parse_event_id(last_event_id)
+
+        yield "retry: 2000\n\n"
+        while True:
+            with self.condition:
+                version = self.version
+                changed = [c for c in channels if self.versions.get(c, 0) > seen]
+                deltas = {c: self._deltas_since(c, seen) for c in changed if c in self.deltas and seen >= 0}
+
+            events = []
+            for channel in changed:
+                if deltas.get(channel) is not None:
+                    events += [f"id: {self.epoch}.{version}\nevent: {channel}\ndata: {data}\n\n" for data in deltas[channel]]
+                    continue
+                payload = renderers[channel]()
+                if channel in self.deltas:
+                    payload = f'{{"type": "snapshot", "seq": {version}, "jobs": {payload}}}'
+                if payload != last_sent.get(channel):
+                    events.append(f"id: {self.epoch}.{version}\nevent: {channel}\ndata: {payload}\n\n")
+                    last_sent[channel] = payload
+            seen = version
+            if events: yield "".join(events)
+
+            if self.wait(channels, seen, keepalive) == seen:
+                yield ": keep-alive\n\n"
+
+    def _parse_event_id(self, event_id: str | None) -> int:
+        """Version of an event id from this process, -1 for missing or foreign ids."""
+        epoch, _, version = (event_id or "").partition(".")
+        if epoch != self.epoch or not version.isdigit(): return -1
+        with self.condition:
+            return int(version) if int(version) <= self.version else -1
@@ -9,6 +9,26 @@ class Config:
             self.nc_images_folder = yaml_file["nc_images_folder"]
             self.nc_metadata_folder = yaml_file["nc_metadata_folder"]
             self.nc_check_time = yaml_file["nc_check_time"]
+            self.nc_url = yaml_file.get("nc_url", "https://storage.canstein-berlin.de")
+            self.nc_backend = yaml_file.get("nc_backend", "owncloud")
+            self.nc_connections = max(1, int(yaml_file.get("nc_connections", 2)))
+            self.nc_pipeline_depth = max(1, int(yaml_file.get("nc_pipeline_depth", 8)))
+            # The ETag probe is cheap: poll faster than nc_check_time after activity, never slower when idle
+            self.nc_check_time_min = float(yaml_file.get("nc_check_time_min", self.nc_check_time / 4))
+            self.nc_check_time_max = max(self.nc_check_time_min, float(yaml_file.get("nc_check_time_max", self.nc_check_time)))
+            self.nc_download_workers = max(1, int(yaml_file.get("nc_download_workers", 4)))
+            self.ingest_decode_workers = max(1, int(yaml_file.get("ingest_decode_workers", 2)))
+            self.ingest_queue_size = max(1, int(yaml_file.get("ingest_queue_size", 16)))
+            self.overlay_cache_mb = yaml_file.get("overlay_cache_mb", 256)
+            self.thumbnail_cache_mb = yaml_file.get("thumbnail_cache_mb", 64)
+            self.prerender_cache_mb = yaml_file.get("prerender_cache_mb", 512)
+            self.prerender_unlisted = yaml_file.get("prerender_unlisted", False)
+            self.ingest_max_mb = yaml_file.get("ingest_max_mb", 32)
+            self.ingest_token = yaml_file.get("ingest_token")
+            self.ingest_dedupe = yaml_file.get("ingest_dedupe", True)
+            self.ingest_dedupe_window = float(yaml_file.get("ingest_dedupe_window", 600))
+            self.ingest_dedupe_perceptual = yaml_file.get("ingest_dedupe_perceptual", False)
+            self.ingest_dedupe_distance = int(yaml_file.get("ingest_dedupe_distance", 4))
 
 if __name__ == "__main__":
     config = Config()
\ No newline at end of file
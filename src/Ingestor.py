@@ -0,0 +1,271 @@
+import hashlib
+import io
+import json
+import os
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, BinaryIO
+
+from PIL import Image, UnidentifiedImageError
+
+from src.PrintJob import PrintJob
+
+if TYPE_CHECKING:
+    from src.PrintManager import PrintManager
+
+
+class IngestTooLarge(Exception):
+    pass
+
+
+class DuplicateImage(Exception):
+    def __init__(self, job_uuid: str):
+        super().__init__("Duplicate of job " + job_uuid)
+        self.job_uuid = job_uuid
+
+
+class PartFile:
+    """
+    Write target for an incoming image in the images folder. Hashes the bytes while
+    they are written, so the data is written once and never read back for dedupe.
+    Also usable as werkzeug stream_factory result: unknown attributes go to the file.
+    """
+
+    def __init__(self, path: str, new_name: str):
+        self.path = path
+        self.new_name = new_name
+        self.file = open(path, "wb+")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def close(self):
+        self.file.close()
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class Ingestor:
+    """
+    Turns incoming screenshots (Nextcloud downloads or direct uploads) into PrintJobs.
+    Images are written straight into the images folder and checked for completeness
+    without a full decode (PNG chunk checksums, JPEG at 1/8 scale).
+
+    Duplicates (upload retries, double clicks) are recognised by the SHA-256 of the
+    bytes, computed while streaming and checked before anything is decoded. Optionally
+    a 64 bit difference hash also catches near-identical screenshots.
+    """
+    IMAGES_FOLDER = "downloads/images/"
+    # Formats that are stored as received, everything else is converted to PNG
+    KEEP_FORMATS = {"PNG": ".png", "JPEG": ".jpg"}
+    CHUNK_SIZE = 64 * 1024
+    # Number of idempotency keys remembered for upload retries
+    IDEMPOTENCY_KEYS = 1024
+    # Number of recent images remembered for duplicate detection
+    RECENT_IMAGES = 512
+
+    def __init__(self, pm: "PrintManager"):
+        self.pm = pm
+        self.config = pm.config
+        self.idempotency_keys: OrderedDict[str, str | None] = OrderedDict()   # key → job uuid, None while in progress
+        self.recent_hashes: OrderedDict[str, tuple[str, float]] = OrderedDict()   # sha256 → (job uuid, time)
+        self.recent_dhashes: OrderedDict[int, tuple[str, float]] = OrderedDict()  # dHash → (job uuid, time)
+        self.lock = threading.Lock()
+
+        os.makedirs(self.IMAGES_FOLDER, exist_ok=True)
+
+    def create_job(self, stream: BinaryIO, metadata: dict, max_bytes: int | None = None) -> PrintJob:
+        """
+        Stores the image from stream and builds a PrintJob for it.
+        :raises UnidentifiedImageError: if the data is not a readable image
+        :raises IngestTooLarge: if the stream exceeds max_bytes
+        :raises DuplicateImage: if the same image arrived recently
+        """
+        new_name = str(uuid.uuid4())
+        image_file = self.store_image(stream, new_name, max_bytes)
+        self.generate_thumbnail(image_file)
+        return PrintJob(new_name, image_file, metadata)
+
+    def create_job_from_part(self, part: PartFile, metadata: dict) -> PrintJob:
+        """Like create_job, for an upload the form parser already wrote into a PartFile."""
+        image_file = self.store_part(part)
+        self.generate_thumbnail(image_file)
+        return PrintJob(part.new_name, image_file, metadata)
+
+    def new_part(self, new_name: str | None = None) -> PartFile:
+        new_name = new_name or str(uuid.uuid4())
+        return PartFile(self.IMAGES_FOLDER + new_name + ".part", new_name)
+
+    def store_image(self, stream: BinaryIO, new_name: str, max_bytes: int | None = None) -> str:
+        """
+        Streams an image into the images folder under a new name.
+        PNG and JPEG files are written as received, other formats are converted to PNG.
+        :return: The path to the stored image
+        :raises DuplicateImage: if the same image arrived recently (new_name is then not used)
+        """
+        part = self.new_part(new_name)
+        try:
+            while chunk := stream.read(self.CHUNK_SIZE):
+                if max_bytes is not None and part.size + len(chunk) > max_bytes:
+                    raise IngestTooLarge(f"Image exceeds {max_bytes} bytes")
+                part.write(chunk)
+        except BaseException:
+            part.discard()
+            raise
+        return self.store_part(part)
+
+    def store_part(self, part: PartFile) -> str:
+        """
+        Moves a completely written PartFile into place, see store_image.
+        The part file is gone afterward, also on errors.
+        """
+        part.close()
+        new_name = part.new_name
+        digest, dhash = None, None
+        try:
+            if self.config.ingest_dedupe:
+                digest = part.sha256.hexdigest()
+                self._claim_recent(self.recent_hashes, digest, new_name)
+
+            self._verify(part.path)
+
+            if self.config.ingest_dedupe_perceptual:
+                with Image.open(part.path) as image:
+                    dhash = self._dhash(image)
+                self._claim_similar(dhash, new_name)
+
+            with Image.open(part.path) as image:
+                extension = self.KEEP_FORMATS.get(image.format)
+                if extension is None:
+                    path = self.IMAGES_FOLDER + new_name + ".png"
+                    image.save(path, format="PNG")
+                    return path
+
+            path = self.IMAGES_FOLDER + new_name + extension
+            os.replace(part.path, path)
+            return path
+        except BaseException:
+            self._release(digest, dhash, new_name)
+            raise
+        finally:
+            part.discard()
+
+    def store_image_bytes(self, data: bytes, new_name: str) -> str:
+        """:raises DuplicateImage: if the same image arrived recently"""
+        return self.store_image(io.BytesIO(data), new_name)
+
+    def generate_thumbnail(self, image_file: str):
+        try:
+            self.pm.thumbnails.generate(image_file)
+        except Exception:
+            self.pm.app.logger.exception("Error generating thumbnail for " + image_file)
+
+    def parse_metadata(self, raw: bytes | str, source: str) -> dict:
+        if not raw: return {}
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict): raise ValueError("Metadata is not an object")
+            data["metadata_path"] = source
+            return data
+        except Exception:
+            self.pm.app.logger.exception("Error loading Metadata!, Skipping " + source)
+        return {}
+
+    # ========= Duplicates ========= #
+    def _claim_recent(self, index: OrderedDict, key, new_name: str):
+        """Registers key for new_name, or raises DuplicateImage if it was seen within the dedupe window."""
+        now = time.monotonic()
+        with self.lock:
+            previous = index.get(key)
+            if previous is not None and now - previous[1] < self.config.ingest_dedupe_window:
+                raise DuplicateImage(previous[0])
+            index[key] = (new_name, now)
+            index.move_to_end(key)
+            while len(index) > self.RECENT_IMAGES:
+                index.popitem(last=False)
+
+    def _claim_similar(self, dhash: int, new_name: str):
+        """Like _claim_recent, but matches any dHash within ingest_dedupe_distance bits."""
+        now = time.monotonic()
+        with self.lock:
+            for other, (job_uuid, seen) in self.recent_dhashes.items():
+                if now - seen < self.config.ingest_dedupe_window and (dhash ^ other).bit_count() <= self.config.ingest_dedupe_distance:
+                    raise DuplicateImage(job_uuid)
+            self.recent_dhashes[dhash] = (new_name, now)
+            self.recent_dhashes.move_to_end(dhash)
+            while len(self.recent_dhashes) > self.RECENT_IMAGES:
+                self.recent_dhashes.popitem(last=False)
+
+    def _release(self, digest: str | None, dhash: int | None, new_name: str):
+        """Forgets the hashes claimed for an image that was not stored."""
+        with self.lock:
+            for index, key in ((self.recent_hashes, digest), (self.recent_dhashes, dhash)):
+                if key is not None and index.get(key, ("",))[0] == new_name:
+                    del index[key]
+
+    @staticmethod
+    def _verify(path: str):
+        """
+        The header alone lets truncated files through, which only fail once rendered.
+        :raises UnidentifiedImageError: if the image is truncated or corrupt
+        """
+        try:
+            with Image.open(path) as image:
+                if image.format == "PNG":
+                    image.verify()   # checks the CRC of every chunk without decompressing
+                else:
+                    image.draft(image.mode, (image.width // 8, image.height // 8))
+                    image.load()
+        except UnidentifiedImageError:
+            raise
+        except (OSError, SyntaxError, ValueError, struct.error) as e:
+            raise UnidentifiedImageError("Truncated or corrupt image: " + str(e)) from e
+
+    @staticmethod
+    def _dhash(image: Image.Image) -> int:
+        """64 bit difference hash: brightness gradients of a 9×8 greyscale thumbnail."""
+        image.draft("L", (64, 64))
+        pixels = image.convert("L").resize((9, 8), Image.BILINEAR).tobytes()
+        bits = 0
+        for row in range(8):
+            for col in range(8):
+                bits = bits << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+        return bits
+
+    # ========= Idempotency ========= #
+    def claim_idempotency_key(self, key: str) -> tuple[bool, str | None]:
+        """
+        Reserves an idempotency key for a new upload.
+        :return: (True, None) if the key is new, otherwise (False, uuid of the earlier job or None if still in progress)
+        """
+        with self.lock:
+            if key in self.idempotency_keys:
+                self.idempotency_keys.move_to_end(key)
+                return False, self.idempotency_keys[key]
+            self.idempotency_keys[key] = None
+            while len(self.idempotency_keys) > self.IDEMPOTENCY_KEYS:
+                self.idempotency_keys.popitem(last=False)
+            return True, None
+
+    def complete_idempotency_key(self, key: str, job_uuid: str | None):
+        """Stores the job uuid for a claimed key, or releases the key if the upload failed."""
+        with self.lock:
+            if job_uuid is None:
+                self.idempotency_keys.pop(key, None)
+            else:
+                self.idempotency_keys[key] = job_uuid
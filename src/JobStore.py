@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+
+from src.Broadcaster import Broadcaster, Delta
+from src.PrintJob import PrintJob
+
+
+class JobStore:
+    """
+    The pending jobs of the PrintManager: the print queue and the unlisted jobs.
+    Both lists are ordered dicts keyed by uuid plus a uuid → list index, so lookup,
+    dequeue and removal are O(1). Every change happens under one lock, bumps the
+    version and publishes its deltas while still holding it, so the streams see the
+    changes in the order they were made.
+    """
+    QUEUE = Broadcaster.QUEUE
+    UNLISTED = Broadcaster.UNLISTED
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        # Reentrant, so callers can combine several operations atomically
+        self.lock = threading.RLock()
+        self.version = 0
+        self.lists: dict[str, OrderedDict[str, PrintJob]] = {self.QUEUE: OrderedDict(), self.UNLISTED: OrderedDict()}
+        self.index: dict[str, str] = {}   # uuid → list
+
+    def jobs(self, name: str) -> list[PrintJob]:
+        with self.lock:
+            return list(self.lists[name].values())
+
+    def count(self, name: str) -> int:
+        return len(self.lists[name])
+
+    def find(self, uuid: str) -> PrintJob | None:
+        with self.lock:
+            name = self.index.get(uuid)
+            return None if name is None else self.lists[name][uuid]
+
+    def location(self, uuid: str) -> str | None:
+        """Name of the list holding the job."""
+        return self.index.get(uuid)
+
+    def contains(self, job: PrintJob) -> bool:
+        with self.lock:
+            name = self.index.get(job.uuid)
+            return name is not None and self.lists[name][job.uuid] is job
+
+    def append(self, name: str, job: PrintJob):
+        with self.lock:
+            if job.uuid in self.index: raise ValueError("Job already stored: " + job.uuid)
+            self._insert(name, job)
+            self._publish(Delta(name, "add", job.uuid, len(self.lists[name]) - 1, job.to_json()))
+
+    def pop_first(self, name: str) -> PrintJob | None:
+        with self.lock:
+            if not self.lists[name]: return None
+            uuid, job = self.lists[name].popitem(last=False)
+            del self.index[uuid]
+            self._publish(Delta(name, "remove", uuid))
+            return job
+
+    def remove(self, uuid: str) -> PrintJob | None:
+        with self.lock:
+            name = self.index.pop(uuid, None)
+            if name is None: return None
+            job = self.lists[name].pop(uuid)
+            self._publish(Delta(name, "remove", uuid))
+            return job
+
+    def move(self, uuid: str, name: str, index: int | None = None) -> PrintJob | None:
+        """
+        Moves a job to position index (default: the end) of list name, which may be
+        the list it is already in (reorder).
+        :return: The job, None if it is not stored
+        """
+        with self.lock:
+            source = self.index.get(uuid)
+            if source is None: return None
+
+            if source == name:
+                job = self.lists[name].pop(uuid)
+                deltas = []
+            else:
+                job = self.lists[source].pop(uuid)
+                del self.index[uuid]
+                deltas = [Delta(source, "remove", uuid)]
+
+            index = self._insert(name, job, index)
+            if source == name:
+                deltas.append(Delta(name, "move", uuid, index))
+            else:
+                deltas.append(Delta(name, "add", uuid, index, job.to_json()))
+            self._publish(*deltas)
+            return job
+
+    def to_json(self, name: str) -> str:
+        with self.lock:
+            return "[" + ", ".join(job.to_json() for job in self.lists[name].values()) + "]"
+
+    def _insert(self, name: str, job: PrintJob, index: int | None = None) -> int:
+        jobs = self.lists[name]
+        jobs[job.uuid] = job
+        self.index[job.uuid] = name
+        if index is None or index >= len(jobs) - 1: return len(jobs) - 1
+
+        # Move every job from index on behind the new one
+        index = max(0, index)
+        for uuid in list(jobs)[index:-1]:
+            jobs.move_to_end(uuid)
+        return index
+
+    def _publish(self, *deltas: Delta):
+        self.version += 1
+        self.broadcaster.publish_deltas(*deltas)
@@ -1,67 +1,119 @@
 import json
 import os
+from types import MappingProxyType
+from typing import Mapping
 
 from PIL import Image, ImageColor
 
+from src.image import pixels
 from src.image.Overlay import Overlay
 
 
 class PrintJob:
+    # Jobs liegen zu Hunderten im Speicher → kein __dict__ pro Instanz
+    __slots__ = ("_uuid", "_image_file", "_metadata", "_overlay_path", "version", "_json")
+
     def __init__(self, uuid: str, image_file: str, metadata: dict):
-        self.uuid = uuid
-        self.image_file = image_file
+        self._uuid = uuid
+        self._image_file = image_file
+        self._overlay_path: str | None = None
+        self._json: tuple[int, str] | None = None   # (version, to_json())
+        self.version = 0
         self.metadata = metadata
 
-        self.selected_overlay: Overlay|None = None
-        self.pc_name: str = metadata.get("pcName", "-")
-        self.plot: str = metadata.get("plotId", "-")
-
-    def apply_default_overlay_if_not_present(self, overlay: Overlay):
-        if self.selected_overlay is None:
-            self.selected_overlay = Overlay("website/static/overlay-templates/new_overlay.json")
-
-        print("Applying default overlay")
-
-    def open_and_preprocess_image(self):
+    # Änderungen nur über die Setter, damit der serialisierte Stand nicht veraltet
+    def _changed(self):
+        self.version += 1
+
+    @property
+    def uuid(self) -> str:
+        return self._uuid
+
+    @property
+    def image_file(self) -> str:
+        return self._image_file
+
+    @image_file.setter
+    def image_file(self, image_file: str):
+        self._image_file = image_file
+        self._changed()
+
+    @property
+    def overlay_path(self) -> str | None:
+        """Template des Jobs; aufgelöst wird erst beim Rendern, damit Änderungen an der Datei greifen."""
+        return self._overlay_path
+
+    @overlay_path.setter
+    def overlay_path(self, overlay_path: str | None):
+        if overlay_path == self._overlay_path: return
+        self._overlay_path = overlay_path
+        self._changed()
+
+    @property
+    def metadata(self) -> Mapping:
+        """Read-only view; edits go through the setter or update_metadata()."""
+        return MappingProxyType(self._metadata)
+
+    @metadata.setter
+    def metadata(self, metadata: Mapping):
+        self._metadata = dict(metadata)
+        self._changed()
+
+    def update_metadata(self, **fields):
+        self.metadata = {**self._metadata, **fields}
+
+    # Aus den Metadaten abgeleitet, daher nur lesbar
+    @property
+    def pc_name(self) -> str:
+        return self._metadata.get("pcName", "-")
+
+    @property
+    def plot(self) -> str:
+        return self._metadata.get("plotId", "-")
+
+    def open_and_preprocess_image(self, overlay: Overlay | None):
         image = Image.open(self.image_file)
-        if self.selected_overlay is None: return image
+        if overlay is None: return image
 
-        image = self.selected_overlay.apply(image, self)
-        return self.pad_xy(image, 10, 30)
+        image = overlay.apply(image, self)
+        # Rand hinzufügen und direkt auf Weiß flatten (druckfertiges RGB, ein Puffer)
+        return pixels.flatten_and_pad(image, 10, 30)
 
-    def pad_xy(self, img: Image.Image, xPad: int, yPad: int, bg=None) -> Image.Image:
-        if xPad < 0 or yPad < 0:
-            raise ValueError("xAbstand und yAbstand müssen >= 0 sein")
-
-        w, h = img.size
-        mode = img.mode
-
-        # Standard-Hintergrund bestimmen
-        if bg is None:
-            if "A" in mode:  # z.B. RGBA, LA
-                bg = (0, 0, 0, 0)
-            elif mode == "L":  # Graustufe
-                bg = 255
-            else:
-                bg = (255, 255, 255)
+    def render_preview(self, overlay: Overlay | None = None, scale: float = 0.25) -> Image.Image:
+        """
+        Schnelle Vorschau des Jobs unter einem Overlay (Entwurfsmodus, RGB).
+        Ohne Overlay wird nur das Bild verkleinert.
+        """
+        image = Image.open(self.image_file)
+        if overlay is None:
+            image.draft("RGB", (int(image.width * scale), int(image.height * scale)))
+            image.thumbnail((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.BILINEAR)
+            return image.convert("RGB")
 
-        neu = Image.new(mode, (w + 2 * xPad, h + 2 * yPad), bg)
-        neu.paste(img, (xPad, yPad))
-        return neu
+        image = overlay.apply(image, self, draft_scale=scale)
+        return pixels.flatten_onto_white(image)
 
     def delete(self):
         os.remove(self.image_file)
 
-    def to_json(self):
-        return json.dumps({
+    def to_json(self) -> str:
+        """Serialised once per version and shared by all streams."""
+        version = self.version
+        cached = self._json
+        if cached is not None and cached[0] == version: return cached[1]
+
+        data = json.dumps({
             "image_url": "/api/images-ext/" + str(self.image_file),
+            "thumbnail_url": "/api/thumbnails/" + str(self.image_file),
             "uuid": self.uuid,
             "pc_name": self.pc_name,
             "plot": self.plot,
-            "metadata": self.metadata,
-            "overlay": "" if self.selected_overlay is None else self.selected_overlay.overlay_path
+            "metadata": self._metadata,
+            "overlay": self.overlay_path or ""
         })
+        self._json = (version, data)
+        return data
 
     def __str__(self):
-        return f"PrintJob(image_file='{self.image_file}', metadata={self.metadata}, selected_overlay={self.selected_overlay})"
+        return f"PrintJob(image_file='{self.image_file}', metadata={self._metadata}, overlay_path={self.overlay_path!r})"
 
@@ -1,63 +1,122 @@
 import os
 from flask import Flask
 
+from src.Broadcaster import Broadcaster
 from src.Config import Config
+from src.Ingestor import Ingestor
+from src.JobStore import JobStore
 from src.PrintJob import PrintJob
+from src.image.FontRegistry import get_font_registry
 from src.image.Overlay import Overlay
+from src.image.OverlayRegistry import OverlayRegistry
+from src.image.RenderCache import RenderCache
+from src.image.ThumbnailCache import ThumbnailCache
 from src.threads.NextcloudFetcherThread import NextcloudFetcherThread
+from src.threads.PrerenderThread import PrerenderThread
 from src.threads.PrinterThread import PrinterThread
 
 
 class PrintManager:
+    DEFAULT_OVERLAY = "website/static/overlay-templates/new_overlay.json"
+
     def __init__(self, config_file: str, app: Flask):
         self.status: str                 = ""
         self.print_on_receive: bool      = True
         self.config: Config              = Config(config_file)
-        self.unlisted: list[PrintJob]    = []
-        self.queue: list[PrintJob]       = []
-        self.default_overlay: Overlay    = Overlay("website/static/overlay-templates/new_overlay.json")
+        self.overlays: OverlayRegistry   = OverlayRegistry(self.config.overlay_cache_mb * 1024 * 1024)
         self.app: Flask                  = app
+        self.broadcaster: Broadcaster    = Broadcaster()
+        self.jobs: JobStore              = JobStore(self.broadcaster)
+
+        # Font-Verzeichnisse und Standard-Template einmalig beim Start laden
+        get_font_registry()
+        self.overlays.get(self.DEFAULT_OVERLAY)
 
         self.current_print_job: PrintJob = None
         self.paused: bool                = False
 
         self.nextcloud_fetcher = NextcloudFetcherThread(self)
         self.printer_thread = PrinterThread(self)
+        self.prerender_thread = PrerenderThread(self)
 
         os.makedirs("downloads/images", exist_ok=True)
-        os.makedirs("downloads/metadata", exist_ok=True)
-        os.makedirs("downloads/temp", exist_ok=True)
+
+        self.thumbnails: ThumbnailCache  = ThumbnailCache("downloads/thumbnails", self.config.thumbnail_cache_mb * 1024 * 1024)
+        self.render_cache: RenderCache   = RenderCache("downloads/rendered", self.config.prerender_cache_mb * 1024 * 1024)
+        self.ingestor: Ingestor          = Ingestor(self)
 
     def add_new_job(self, job):
         self.log("Added new job")
-        if self.print_on_receive and len(self.queue) == 0:
-            self.queue.append(job)
-        else:
-            self.unlisted.append(job)
+        if job.overlay_path is None: job.overlay_path = self.DEFAULT_OVERLAY
+        with self.jobs.lock:
+            if self.print_on_receive and self.jobs.count(JobStore.QUEUE) == 0:
+                self.jobs.append(JobStore.QUEUE, job)
+                self.prerender(job)
+            else:
+                self.jobs.append(JobStore.UNLISTED, job)
+                if self.config.prerender_unlisted: self.prerender(job)
 
     def fetch_new_print_job(self) -> PrintJob | None:
-        if len(self.queue) == 0: return None
-        self.current_print_job = self.queue.pop(0)
+        with self.jobs.lock:
+            job = self.jobs.pop_first(JobStore.QUEUE)
+            if job is None: return None
+
+            # Enqueue next job
+            if self.print_on_receive and self.jobs.count(JobStore.QUEUE) == 0:
+                next_job = self.jobs.pop_first(JobStore.UNLISTED)
+                if next_job is not None:
+                    self.jobs.append(JobStore.QUEUE, next_job)
+                    self.prerender(next_job)
+
+        self.set_current_print_job(job)
+
+        return job
 
-        # Enqueue next job
-        if self.print_on_receive and len(self.queue) == 0 and len(self.unlisted) > 0:
-            self.queue.append(self.unlisted.pop(0))
+    def queue_unlisted_job(self, uuid: str) -> PrintJob | None:
+        """Moves an unlisted job to the end of the print queue."""
+        with self.jobs.lock:
+            if self.jobs.location(uuid) != JobStore.UNLISTED: return None
+            job = self.jobs.move(uuid, JobStore.QUEUE)
 
-        self.current_print_job.apply_default_overlay_if_not_present(self.default_overlay)
+        self.prerender(job)
+        return job
 
-        return self.current_print_job
+    def set_current_print_job(self, job: PrintJob | None):
+        self.current_print_job = job
+        self.broadcaster.publish(Broadcaster.CURRENT_JOB, Broadcaster.PROGRESS, Broadcaster.STATUS)
+
+    def prerender(self, job: PrintJob):
+        """Schedules the job for background rendering into the render cache."""
+        self.prerender_thread.submit(job)
+
+    def is_pending(self, job: PrintJob) -> bool:
+        return self.jobs.contains(job)
+
+    def find_job(self, uuid: str) -> PrintJob | None:
+        if self.current_print_job is not None and self.current_print_job.uuid == uuid:
+            return self.current_print_job
+        return self.jobs.find(uuid)
+
+    def overlay_for(self, job: PrintJob) -> Overlay:
+        # Registry lädt nur neu, wenn sich die Template-Datei geändert hat
+        return self.overlays.get(job.overlay_path or self.DEFAULT_OVERLAY)
 
     def set_print_on_receive(self, print_on_receive: bool):
         self.print_on_receive = print_on_receive
 
+    def set_paused(self, paused: bool):
+        self.paused = paused
+        self.broadcaster.publish(Broadcaster.STATUS)
+
     def start(self):
         self.nextcloud_fetcher.start()
         self.printer_thread.start()
-        pass
+        self.prerender_thread.start()
 
     def stop(self):
         self.nextcloud_fetcher.stop()
         self.printer_thread.stop()
+        self.prerender_thread.stop()
 
     def log(self, message: str):
         self.app.logger.info(message)
@@ -0,0 +1,192 @@
+import os
+import sys
+import threading
+from functools import lru_cache
+
+from PIL import ImageFont
+
+
+# Mitgelieferte Fonts (Minecraft etc.) aus der Web-Oberfläche
+BUNDLED_FONT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "website", "static", "fonts"))
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# Bekannte Dateinamen je CSS-Familie: (datei, bold, italic)
+FAMILY_FILES = {
+    "inter": [
+        ("Inter-BoldItalic.ttf",  True,  True),
+        ("Inter-Bold.ttf",        True,  False),
+        ("Inter-Italic.ttf",      False, True),
+        ("Inter-Regular.ttf",     False, False),
+        ("Inter.ttf",             False, False),
+    ],
+    "roboto": [
+        ("Roboto-BoldItalic.ttf", True,  True),
+        ("Roboto-Bold.ttf",       True,  False),
+        ("Roboto-Italic.ttf",     False, True),
+        ("Roboto-Regular.ttf",    False, False),
+        ("Roboto.ttf",            False, False),
+    ],
+    "arial": [
+        ("arialbi.ttf",           True,  True),
+        ("arialbd.ttf",           True,  False),
+        ("ariali.ttf",            False, True),
+        ("arial.ttf",             False, False),
+        ("Arial.ttf",             False, False),
+    ],
+    "dejavu": [
+        ("DejaVuSans-BoldOblique.ttf", True,  True),
+        ("DejaVuSans-Bold.ttf",        True,  False),
+        ("DejaVuSans-Oblique.ttf",     False, True),
+        ("DejaVuSans.ttf",             False, False),
+    ],
+    "verdana": [
+        ("verdanaz.ttf",          True,  True),
+        ("verdanab.ttf",          True,  False),
+        ("verdanai.ttf",          False, True),
+        ("verdana.ttf",           False, False),
+        ("Verdana.ttf",           False, False),
+    ],
+}
+DEFAULT_FAMILY = "dejavu"
+
+
+def _system_font_dirs() -> list[str]:
+    if sys.platform.startswith("win"):
+        windir = os.environ.get("WINDIR", "C:\\Windows")
+        dirs = [os.path.join(windir, "Fonts")]
+        local = os.environ.get("LOCALAPPDATA")
+        if local:
+            dirs.append(os.path.join(local, "Microsoft", "Windows", "Fonts"))
+        return dirs
+    if sys.platform == "darwin":
+        return ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    dirs = [os.path.join(d, "fonts") for d in data_dirs.split(":") if d]
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    dirs += [os.path.join(data_home, "fonts"), os.path.expanduser("~/.fonts")]
+    return dirs
+
+
+class FontRegistry:
+    """
+    Prozessweites Font-Verzeichnis.
+
+    Durchsucht die Font-Ordner einmalig, ordnet CSS-Familie/Gewicht/Stil den
+    Dateien zu und hält geladene FreeTypeFont-Objekte in einem LRU-Cache
+    (Schlüssel: Datei, Pixelgröße).
+    """
+
+    def __init__(self, font_dirs: list[str] | None = None, cache_size: int = 64):
+        self.font_dirs = font_dirs if font_dirs is not None else [BUNDLED_FONT_DIR, "."] + _system_font_dirs()
+        self.files: dict[str, str] = {}                    # dateiname.lower() → Pfad
+        self.families: dict[str, list[tuple]] = {}         # familie → [(pfad, bold, italic)]
+        self._resolved: dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._load_font = lru_cache(maxsize=cache_size)(self._load_font_uncached)
+
+        self.scan()
+
+    def scan(self):
+        files = {}
+        for font_dir in self.font_dirs:
+            if not os.path.isdir(font_dir):
+                continue
+            recursive = os.path.abspath(font_dir) != os.path.abspath(".")
+            for root, dirs, names in os.walk(font_dir):
+                for name in names:
+                    if name.lower().endswith(FONT_EXTENSIONS):
+                        # erster Treffer gewinnt (mitgelieferte Fonts vor Systemfonts)
+                        files.setdefault(name.lower(), os.path.join(root, name))
+                if not recursive:
+                    break
+
+        families = {}
+        for family, candidates in FAMILY_FILES.items():
+            found = [(files[f.lower()], bold, italic) for f, bold, italic in candidates if f.lower() in files]
+            families[family] = found
+
+        # Mitgelieferte Fonts über ihre internen Namen registrieren (z.B. "Minecraft")
+        if os.path.isdir(BUNDLED_FONT_DIR):
+            for name in sorted(os.listdir(BUNDLED_FONT_DIR)):
+                if not name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                path = os.path.join(BUNDLED_FONT_DIR, name)
+                try:
+                    family, style = ImageFont.truetype(path, 12).getname()
+                except Exception:
+                    continue
+                style = (style or "").lower()
+                families.setdefault(family.lower(), []).append(
+                    (path, "bold" in style, "italic" in style or "oblique" in style)
+                )
+
+        with self._lock:
+            self.files = files
+            self.families = families
+            self._resolved = {}
+        self._load_font.cache_clear()
+
+    def resolve(self, css_font_family: str, want_bold: bool = False, want_italic: bool = False):
+        """
+        Sucht passende Font-Datei für (family, weight/style).
+        Gibt (path, exact) zurück; italic-Dateien werden NUR genutzt, wenn want_italic=True.
+        """
+        raw = (css_font_family or "").split(",")[0].strip().strip("'").strip('"').lower()
+        key = (raw, want_bold, want_italic)
+        result = self._resolved.get(key)
+        if result is None:
+            result = self._resolve_uncached(raw, want_bold, want_italic)
+            with self._lock:
+                self._resolved[key] = result
+        return result
+
+    def get_font(self, path: str | None, px: int):
+        """Liefert ein geladenes Font-Objekt (LRU nach (Datei, px)); None → Pillow-Default."""
+        return self._load_font(path, int(px))
+
+    def _resolve_uncached(self, raw: str, want_bold: bool, want_italic: bool):
+        key = DEFAULT_FAMILY
+        for fam in self.families:
+            if fam in raw:
+                key = fam
+                break
+
+        items = self.families.get(key) or []
+
+        if want_italic:
+            # Wenn Italic gewünscht: Italic vor Nicht-Italic
+            ordered = sorted(items, key=lambda t: (t[2] != True) + (t[1] != want_bold))
+        else:
+            # Wenn Italic NICHT gewünscht, strikt nur Nicht-Italic
+            ordered = sorted((t for t in items if not t[2]), key=lambda t: 0 if (t[1] == want_bold) else 1)
+
+        for path, is_bold, is_italic in ordered:
+            return path, (is_bold == want_bold and is_italic == want_italic)
+
+        # Fallback: irgendeine Datei der Familie
+        for path, is_bold, is_italic in items:
+            return path, False
+
+        return None, False
+
+    @staticmethod
+    def _load_font_uncached(path: str | None, px: int):
+        try:
+            return ImageFont.truetype(path, px) if path else ImageFont.load_default(px)
+        except Exception:
+            return ImageFont.load_default(px)
+
+
+_registry: FontRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_font_registry() -> FontRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = FontRegistry()
+    return _registry
@@ -1,8 +1,15 @@
 import json
 import base64
+import hashlib
 import io
+import os
 import re
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
+
+from src.image import pixels
+from src.image.FontRegistry import get_font_registry
+from src.image.TextLayout import layout_text
+from src.image.RenderPlan import RenderPlan, ImageNodePlan, TextNodePlan, StaticLayer, PLACEHOLDERS
 
 
 class Overlay:
@@ -12,7 +19,8 @@ class Overlay:
         target_size=(1772, 1181),
         resize_mode="fill",            # "fill" (Crop) oder "pad" (Letterbox)
         font_scale_strategy="avg",     # "avg","x","y","min","max","none"
-        min_font_px=10
+        min_font_px=10,
+        asset_cache=None
     ):
         """
         overlay_path  : Pfad zur exportierten overlay.json
@@ -26,12 +34,18 @@ class Overlay:
             - "max":    skaliert mit max(sx,sy)
             - "none":   fontSize nicht skalieren
         min_font_px   : minimale Fontgröße nach Skalierung
+        asset_cache   : optionales dict für dekodierte data:image-Quellen (geteilt über Templates)
         """
         self.target_size = (int(target_size[0]), int(target_size[1]))
         self.resize_mode = resize_mode
         self.font_scale_strategy = font_scale_strategy
         self.min_font_px = int(min_font_px)
         self.overlay_path = overlay_path
+        self.asset_cache = asset_cache
+
+        # Version der Template-Datei (für Cache-Invalidierung)
+        st = os.stat(overlay_path)
+        self.version = f"{st.st_mtime_ns:x}-{st.st_size:x}"
 
         with open(overlay_path, "r", encoding="utf-8") as f:
             self.data = json.load(f)
@@ -48,24 +62,76 @@ class Overlay:
         self.src_stage_h = int(stg.get("height")) if stg.get("height") else None
         self.src_dpr     = float(stg.get("devicePixelRatio") or 1.0)
 
+        # kompilierte RenderPlans je Zielgröße
+        self._plans: dict[tuple, RenderPlan] = {}
+
     # =========================== Public API ===========================
 
-    def apply(self, image, printjob):
+    def apply(self, image, printjob, draft_scale=None):
         """
         1) Basismotiv auf Zielgröße skalieren.
-        2) Nodes (inkl. fontSize) von Editor-Stage → Zielgröße skalieren.
-        3) Overlay rendern (Platzhalter %plotid%, %pcname% werden ersetzt).
+        2) Render-Plan für die Zielgröße holen (einmalig kompiliert, siehe compile()).
+        3) Vorgerenderte statische Bänder aufsetzen, dazwischen nur die Text-Nodes
+           mit Platzhaltern (%plotid%, %pcname%) pro Job rendern.
         4) Fertiges PIL.Image.Image (RGBA) zurückgeben.
+
+        draft_scale : optional (0..1) – Vorschau-Modus. Rendert den kompletten Plan
+                      in draft_scale × target_size mit günstigerem Resampling und
+                      nutzt JPEG-draft()-Dekodierung des Basismotivs.
         """
         if not isinstance(image, Image.Image):
             raise TypeError("apply erwartet ein PIL.Image.Image als erstes Argument")
 
-        # 1) Base skalieren
+        plan = self.compile(self.target_size, scale=draft_scale or 1.0)
+
+        # 1) Base skalieren (JPEG: bereits beim Dekodieren verkleinern, falls noch nicht geladen)
+        if plan.scale < 1.0:
+            image.draft("RGB", plan.target_size)
         base = image.convert("RGBA")
-        base = self._resize_base(base, self.target_size, self.resize_mode)
+        base = self._resize_base(base, plan.target_size, plan.resize_mode, plan.resample)
+
+        # 2) Statische Bänder (vorgerendert) und dynamische Nodes in z-Reihenfolge
+        for item in plan.layers:
+            if isinstance(item, StaticLayer):
+                base.alpha_composite(item.image, dest=item.offset)
+            else:
+                base = self._render_node_onto(base, item, printjob)
+
+        return base
 
-        # 2) Skalierungsfaktoren unter Berücksichtigung der DPR
-        tw, th = self.target_size
+    def compile(self, target_size, scale=1.0) -> RenderPlan:
+        """
+        Übersetzt das Template einmalig pro Zielgröße in einen unveränderlichen
+        RenderPlan (skalierte Geometrie, geparste Farben, geladene Fonts,
+        Platzhalter). Pläne werden pro Overlay-Instanz zwischengespeichert.
+
+        scale < 1 erzeugt einen Entwurfs-Plan (Vorschau) in scale × target_size.
+        """
+        target_size = (int(target_size[0]), int(target_size[1]))
+        scale = max(0.01, min(1.0, float(scale)))
+        key = (target_size, scale)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._build_plan(target_size, scale)
+            self._plans[key] = plan
+        return plan
+
+    def memory_usage(self) -> int:
+        """Grobe Schätzung des Speicherbedarfs (Bytes) der dekodierten Bilder und Pläne."""
+        images = [self.bg_image] if self.bg_image else []
+        for plan in self._plans.values():
+            if plan.bg_layer is not None:
+                images.append(plan.bg_layer)
+            images += [n.image for n in plan.nodes if isinstance(n, ImageNodePlan)]
+            images += [l.image for l in plan.layers if isinstance(l, StaticLayer)]
+        # geteilte Assets nur einmal zählen
+        return sum(img.width * img.height * len(img.getbands()) for img in {id(i): i for i in images}.values())
+
+    # =========================== Stage/Scaling ===========================
+
+    def _build_plan(self, target_size, scale=1.0) -> RenderPlan:
+        # Skalierungsfaktoren unter Berücksichtigung der DPR
+        tw, th = target_size
         if self.src_stage_w and self.src_stage_h:
             eff_w = self.src_stage_w * max(1.0, self.src_dpr)
             eff_h = self.src_stage_h * max(1.0, self.src_dpr)
@@ -74,55 +140,124 @@ class Overlay:
         else:
             sx = sy = 1.0
 
-        # Editor-Background überlagern (falls vorhanden)
-        if self.bg_image:
-            bg_layer = self._fit_image(self.bg_image, self.target_size, object_fit="contain")
-            base = Image.alpha_composite(base, bg_layer)
+        # Entwurfsmodus: alles zusätzlich um scale verkleinern, billigerer Filter
+        resample = Image.LANCZOS
+        min_font_px = self.min_font_px
+        if scale < 1.0:
+            target_size = (max(1, int(round(tw * scale))), max(1, int(round(th * scale))))
+            sx, sy = sx * scale, sy * scale
+            min_font_px = max(1, int(round(min_font_px * scale)))
+            resample = Image.BILINEAR
 
-        # 3) Nodes rendern (mit Skalierung)
-        for node in self.nodes:
-            node_scaled = self._scale_node(node, sx, sy)
-
-            ntype = (node_scaled.get("type") or "text").lower()
-            opacity = self._parse_opacity(node_scaled.get("opacity", 1))
-            rotate_deg = self._parse_rotate(node_scaled.get("rotate"))
-            left = int(round(node_scaled.get("left", 0)))
-            top = int(round(node_scaled.get("top", 0)))
-            width = int(round(node_scaled.get("width", 0) or 0))
-            height = int(round(node_scaled.get("height", 0) or 0))
-            if width <= 0 or height <= 0:
-                continue
+        bg_layer = self._fit_image(self.bg_image, target_size, object_fit="contain", resample=resample) if self.bg_image else None
 
-            if ntype == "image":
-                layer = self._render_image_node(node_scaled, (width, height))
-            else:
-                layer = self._render_text_node(node_scaled, (width, height), printjob)
-            if layer is None:
+        nodes = []
+        for node in self.nodes:
+            node_plan = self._compile_node(self._scale_node(node, sx, sy, min_font_px))
+            if node_plan is not None:
+                nodes.append(node_plan)
+
+        return RenderPlan(
+            target_size=target_size,
+            resize_mode=self.resize_mode,
+            bg_layer=bg_layer,
+            nodes=tuple(nodes),
+            layers=self._build_layers(target_size, bg_layer, nodes, resample),
+            scale=scale,
+            resample=resample,
+        )
+
+    def _build_layers(self, target_size, bg_layer, nodes, resample=Image.LANCZOS):
+        """
+        Fasst aufeinanderfolgende statische Nodes (Bilder, fester Text) zu
+        vorgerenderten Bändern zusammen. Dynamische Nodes trennen die Bänder,
+        damit die z-Reihenfolge erhalten bleibt.
+        """
+        layers = []
+        band = bg_layer.copy() if bg_layer is not None else None
+
+        def flush(band):
+            if band is None:
+                return
+            bbox = band.getbbox()
+            if bbox:
+                layers.append(StaticLayer(image=band.crop(bbox), offset=(bbox[0], bbox[1])))
+
+        for node in nodes:
+            if isinstance(node, TextNodePlan) and node.is_dynamic:
+                flush(band)
+                band = None
+                layers.append(node)
                 continue
+            if band is None:
+                band = Image.new("RGBA", target_size, (0, 0, 0, 0))
+            band = self._render_node_onto(band, node, None, resample)
+        flush(band)
+
+        return tuple(layers)
+
+    def _compile_node(self, node):
+        ntype = (node.get("type") or "text").lower()
+        width = int(round(node.get("width", 0) or 0))
+        height = int(round(node.get("height", 0) or 0))
+        if width <= 0 or height <= 0:
+            return None
 
-            if rotate_deg:
-                layer = layer.rotate(rotate_deg, resample=Image.BICUBIC, expand=True)
-            if opacity < 1.0:
-                layer = self._apply_opacity(layer, opacity)
-
-            base = self._paste_rgba(base, layer, (left, top))
+        geometry = dict(
+            left=int(round(node.get("left", 0))),
+            top=int(round(node.get("top", 0))),
+            width=width,
+            height=height,
+            rotate=self._parse_rotate(node.get("rotate")),
+            opacity=self._parse_opacity(node.get("opacity", 1)),
+        )
+
+        if ntype == "image":
+            img = self._load_image_from_src(node.get("src"))
+            if img is None:
+                return None
+            return ImageNodePlan(**geometry, image=img, object_fit=node.get("objectFit", "contain"))
 
-        return base
+        text = str(node.get("text", ""))
+        font_px = self._parse_font_size(node.get("fontSize", "24px"))
 
-    # =========================== Stage/Scaling ===========================
+        # CSS-Flags
+        fw = str(node.get("fontWeight", "")).lower()
+        fs = str(node.get("fontStyle", "")).lower()
+        want_bold   = fw in ("bold", "700", "800", "900")
+        want_italic = fs in ("italic", "oblique")
 
-    def _resize_base(self, img_rgba, target_size, mode):
+        # Font-Datei auswählen (Italic nur wenn gewünscht), geladen über den Registry-Cache
+        fonts = get_font_registry()
+        font_path, exact_variant = fonts.resolve(node.get("fontFamily", ""), want_bold, want_italic)
+        font = fonts.get_font(font_path, font_px)
+
+        return TextNodePlan(
+            **geometry,
+            text=text,
+            placeholders=tuple(p for p in PLACEHOLDERS if p in text),
+            font=font,
+            exact_variant=exact_variant,
+            want_bold=want_bold,
+            want_italic=want_italic,
+            color=self._parse_rgba(node.get("color", "rgba(0,0,0,1)"), default=(0, 0, 0, 255)),
+            bg=self._parse_rgba(node.get("backgroundColor", "rgba(0,0,0,0)"), default=(0, 0, 0, 0)),
+            align=(node.get("textAlign") or "left").lower(),
+            underline="underline" in str(node.get("textDecoration", "")).lower(),
+        )
+
+    def _resize_base(self, img_rgba, target_size, mode, resample=Image.LANCZOS):
         if mode == "fill":
-            return ImageOps.fit(img_rgba, target_size, method=Image.LANCZOS, centering=(0.5, 0.5))
+            return ImageOps.fit(img_rgba, target_size, method=resample, centering=(0.5, 0.5))
         canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
         tmp = img_rgba.copy()
-        tmp.thumbnail(target_size, Image.LANCZOS)
+        tmp.thumbnail(target_size, resample)
         ox = (target_size[0] - tmp.width) // 2
         oy = (target_size[1] - tmp.height) // 2
         canvas.paste(tmp, (ox, oy), tmp)
         return canvas
 
-    def _scale_node(self, n, sx, sy):
+    def _scale_node(self, n, sx, sy, min_font_px=None):
         n = dict(n)
         if isinstance(n.get("left"), (int, float)):
             n["left"] = int(round(n["left"] * sx))
@@ -145,59 +280,51 @@ class Overlay:
                 elif self.font_scale_strategy == "max": factor = max(sx, sy)
                 elif self.font_scale_strategy == "none":factor = 1.0
                 else:                                   factor = (sx + sy) / 2.0
-                scaled = max(self.min_font_px, int(round(base * factor)))
+                scaled = max(self.min_font_px if min_font_px is None else min_font_px, int(round(base * factor)))
                 n["fontSize"] = f"{scaled}px"
-                print("FontSize Scaled to", scaled)
         return n
 
     # =========================== Rendering ===========================
 
-    def _render_image_node(self, node, size_wh):
-        src = node.get("src")
-        obj_fit = node.get("objectFit", "contain")
-        img = self._load_image_from_src(src)
-        if img is None:
-            return None
-        return self._fit_image(img, size_wh, object_fit=obj_fit)
-
-    def _render_text_node(self, node, size_wh, printjob):
-        # Platzhalter
-        text = str(node.get("text", ""))
-        text = text.replace("%plotid%", str(getattr(printjob, "plot", "")))
-        text = text.replace("%pcname%", str(getattr(printjob, "pcname", "")))
-
-        font_px = self._parse_font_size(node.get("fontSize", "24px"))
-        font_family = node.get("fontFamily", "")
-
-        # CSS-Flags
-        fw = str(node.get("fontWeight", "")).lower()
-        fs = str(node.get("fontStyle", "")).lower()
-        want_bold   = fw in ("bold", "700", "800", "900")
-        want_italic = fs in ("italic", "oblique")
-
-        # Font-Datei auswählen (Italic nur wenn gewünscht)
-        font_path, exact_variant = self._pick_font_path(font_family, want_bold, want_italic)
-        try:
-            font = ImageFont.truetype(font_path, font_px) if font_path else ImageFont.load_default(font_px)
-        except Exception:
-            font = ImageFont.load_default(font_px)
-            exact_variant = False
-
-        color = self._parse_rgba(node.get("color", "rgba(0,0,0,1)"), default=(0, 0, 0, 255))
-        bg = self._parse_rgba(node.get("backgroundColor", "rgba(0,0,0,0)"), default=(0, 0, 0, 0))
-        align = (node.get("textAlign") or "left").lower()
-        text_decoration = str(node.get("textDecoration", "")).lower()
-        underline = "underline" in text_decoration
-
-        w, h = size_wh
+    def _render_node_onto(self, base, node, printjob, resample=Image.LANCZOS):
+        if isinstance(node, ImageNodePlan):
+            layer = self._render_image_node(node, resample)
+        else:
+            layer = self._render_text_node(node, printjob)
+        if layer is None:
+            return base
+
+        left, top = node.left, node.top
+        if node.rotate:
+            layer = layer.rotate(node.rotate, resample=Image.BICUBIC, expand=True)
+            # expand=True vergrößert den Layer; um die Box-Mitte drehen (CSS transform-origin: center)
+            left -= (layer.width - node.width) // 2
+            top -= (layer.height - node.height) // 2
+        if node.opacity < 1.0:
+            layer = self._apply_opacity(layer, node.opacity)
+
+        return self._paste_rgba(base, layer, (left, top))
+
+    def _render_image_node(self, node: ImageNodePlan, resample=Image.LANCZOS):
+        return self._fit_image(node.image, (node.width, node.height), object_fit=node.object_fit, resample=resample)
+
+    def _render_text_node(self, node: TextNodePlan, printjob):
+        text = node.resolve_text(printjob)
+        font = node.font
+        color = node.color
+        bg = node.bg
+        align = node.align
+        underline = node.underline
+
+        w, h = node.width, node.height
         layer = Image.new("RGBA", (w, h), (0, 0, 0, 0))
         draw = ImageDraw.Draw(layer)
 
         if bg[3] > 0:
             draw.rectangle([(0, 0), (w, h)], fill=bg)
 
-        # Zeilenumbruch
-        lines = self._wrap_text(text, font, max_width=w)
+        # Zeilenumbruch + Ausrichtung (memoisiert)
+        lines = layout_text(text, font, w, align)
 
         # Metriken
         try:
@@ -211,41 +338,31 @@ class Overlay:
         ul_thick  = max(1, round(font.size * 0.07))
 
         # Fallbacks bei fehlenden Varianten
-        use_faux_bold = want_bold and not exact_variant
-        use_faux_italic = want_italic and not exact_variant
+        use_faux_bold = node.want_bold and not node.exact_variant
+        use_faux_italic = node.want_italic and not node.exact_variant
 
         # Für Faux-Italic separat zeichnen, dann scheren
         target_img = layer
         target_draw = draw
-        if use_faux_italic:
+        # Mit Hintergrund wird nur der Text geschert, sonst direkt der Layer
+        if use_faux_italic and bg[3] > 0:
             target_img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
             target_draw = ImageDraw.Draw(target_img)
 
         y = 0
+        line_h = ascent + descent
         for line in lines:
-            try:
-                line_w = int(round(target_draw.textlength(line, font=font)))
-            except Exception:
-                bbox = target_draw.textbbox((0, 0), line, font=font)
-                line_w = bbox[2] - bbox[0]
-            line_h = ascent + descent
-
-            if align == "center":
-                x = (w - line_w) // 2
-            elif align == "right":
-                x = max(0, w - line_w)
-            else:
-                x = 0
+            x, line_w = line.x, line.width
 
             # Zeichnen (Faux-Bold via stroke)
             if use_faux_bold:
                 target_draw.text(
-                    (x, y), line, font=font, fill=color,
+                    (x, y), line.text, font=font, fill=color,
                     stroke_width=max(1, round(font.size * 0.06)),
                     stroke_fill=color
                 )
             else:
-                target_draw.text((x, y), line, font=font, fill=color)
+                target_draw.text((x, y), line.text, font=font, fill=color)
 
             # Unterstrich an Baseline
             if underline:
@@ -260,17 +377,18 @@ class Overlay:
 
         if use_faux_italic:
             shear = 0.21  # ~12°
-            new_w = int(w + shear * h)
+            # Scheren und mittig auf w zuschneiden in einer Transformation
+            left_crop = max(0, (int(w + shear * h) - w) // 2)
             sheared = target_img.transform(
-                (new_w, h),
+                (w, h),
                 Image.AFFINE,
-                (1, shear, 0, 0, 1, 0),
+                (1, shear, left_crop, 0, 1, 0),
                 resample=Image.BICUBIC
             )
-            if new_w > w:
-                left_crop = (new_w - w) // 2
-                sheared = sheared.crop((left_crop, 0, left_crop + w, h))
-            layer = Image.alpha_composite(layer, sheared)
+            if target_img is layer:
+                layer = sheared
+            else:
+                layer.alpha_composite(sheared)
 
         return layer
 
@@ -327,6 +445,18 @@ class Overlay:
         if isinstance(src, Image.Image):
             return src.convert("RGBA")
         s = str(src)
+        if not s.startswith("data:image/") or self.asset_cache is None:
+            return self._decode_image_src(s)
+
+        key = hashlib.sha1(s.encode("ascii", "ignore")).hexdigest()
+        img = self.asset_cache.get(key)
+        if img is None:
+            img = self._decode_image_src(s)
+            if img is not None:
+                self.asset_cache[key] = img
+        return img
+
+    def _decode_image_src(self, s):
         try:
             if s.startswith("data:image/"):
                 header, b64 = s.split(",", 1)
@@ -338,14 +468,14 @@ class Overlay:
         except Exception:
             return None
 
-    def _fit_image(self, img, size_wh, object_fit="contain"):
+    def _fit_image(self, img, size_wh, object_fit="contain", resample=Image.LANCZOS):
         w, h = size_wh
         canvas = Image.new("RGBA", (w, h), (0, 0, 0, 0))
         if w <= 0 or h <= 0:
             return canvas
 
         if object_fit == "fill":
-            scaled = img.resize((w, h), Image.LANCZOS)
+            scaled = img.resize((w, h), resample)
             canvas.paste(scaled, (0, 0), scaled)
             return canvas
 
@@ -355,134 +485,28 @@ class Overlay:
         scale = min(w / iw, h / ih)
         nw = max(1, int(round(iw * scale)))
         nh = max(1, int(round(ih * scale)))
-        scaled = img.resize((nw, nh), Image.LANCZOS)
+        scaled = img.resize((nw, nh), resample)
         ox = (w - nw) // 2
         oy = (h - nh) // 2
         canvas.paste(scaled, (ox, oy), scaled)
         return canvas
 
     def _apply_opacity(self, rgba_img, opacity):
-        if rgba_img.mode != "RGBA":
-            rgba_img = rgba_img.convert("RGBA")
-        r, g, b, a = rgba_img.split()
-        a = a.point(lambda px: int(px * opacity))
-        return Image.merge("RGBA", (r, g, b, a))
+        return pixels.apply_opacity(rgba_img, opacity)
 
     def _paste_rgba(self, base, layer, xy):
-        tmp = Image.new("RGBA", base.size, (0, 0, 0, 0))
-        tmp.paste(layer, xy, layer)
-        return Image.alpha_composite(base, tmp)
-
-    def _wrap_text(self, text, font, max_width):
-        hard_lines = text.replace("\r", "").split("\n")
-        wrapped = []
-        measurer = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-        for hl in hard_lines:
-            words = hl.split(" ")
-            line = ""
-            for w in words:
-                test = w if not line else (line + " " + w)
-                try:
-                    ok_width = measurer.textlength(test, font=font)
-                except Exception:
-                    bbox = measurer.textbbox((0, 0), test, font=font)
-                    ok_width = bbox[2] - bbox[0]
-                if ok_width <= max_width or not line:
-                    line = test
-                else:
-                    wrapped.append(line)
-                    line = w
-            wrapped.append(line)
-        return wrapped
-
-    def _pick_font_path(self, css_font_family: str, want_bold: bool = False, want_italic: bool = False):
         """
-        Sucht passende TTF-Datei für (family, weight/style).
-        Gibt (path, exact) zurück; italic-Dateien werden NUR genutzt, wenn want_italic=True.
-        Ergänze die Pfade bei Bedarf für dein System.
+        Blendet den Layer an xy in base ein (in-place). Es wird nur die auf die
+        Fläche geclippte Bounding-Box des Layers verrechnet, negative Offsets
+        und über den Rand ragende (z.B. rotierte) Layer werden abgeschnitten.
         """
-        raw = (css_font_family or "").split(",")[0].strip().strip("'").strip('"').lower()
-
-        families = {
-            "inter": [
-                ("Inter-BoldItalic.ttf",  True,  True),
-                ("Inter-Bold.ttf",        True,  False),
-                ("Inter-Italic.ttf",      False, True),
-                ("Inter-Regular.ttf",     False, False),
-                ("Inter.ttf",             False, False),
-            ],
-            "roboto": [
-                ("Roboto-BoldItalic.ttf", True,  True),
-                ("Roboto-Bold.ttf",       True,  False),
-                ("Roboto-Italic.ttf",     False, True),
-                ("Roboto-Regular.ttf",    False, False),
-                ("Roboto.ttf",            False, False),
-            ],
-            "arial": [
-                ("arialbi.ttf",           True,  True),
-                ("arialbd.ttf",           True,  False),
-                ("ariali.ttf",            False, True),
-                ("arial.ttf",             False, False),
-                ("Arial.ttf",             False, False),
-            ],
-            "dejavu": [
-                ("DejaVuSans-BoldOblique.ttf", True,  True),
-                ("DejaVuSans-Bold.ttf",        True,  False),
-                ("DejaVuSans-Oblique.ttf",     False, True),
-                ("DejaVuSans.ttf",             False, False),
-            ],
-            "verdana": [
-                ("verdanaz.ttf",          True,  True),
-                ("verdanab.ttf",          True,  False),
-                ("verdanai.ttf",          False, True),
-                ("verdana.ttf",           False, False),
-                ("Verdana.ttf",           False, False),
-            ],
-        }
-
-        key = "dejavu"
-        for fam in families:
-            if fam in raw:
-                key = fam
-                break
-
-        items = families[key]
-
-        # Wenn Italic NICHT gewünscht, priorisieren wir strikt Nicht-Italic
-        non_it = [t for t in items if not t[2]]
-        it     = [t for t in items if t[2]]
-        non_it.sort(key=lambda t: 0 if (t[1] == want_bold) else 1)
-        it.sort(key=lambda t: 0 if (t[1] == want_bold) else 1)
-        ordered = non_it + (it if want_italic else [])
-
-        # Wenn Italic gewünscht: Italic vor Nicht-Italic
-        if want_italic:
-            ordered = sorted(items, key=lambda t: (t[2] != True) + (t[1] != want_bold))
-
-        for path, is_bold, is_italic in ordered:
-            if is_italic and not want_italic:
-                continue
-            try:
-                ImageFont.truetype(path, 12)
-                exact = (is_bold == want_bold and is_italic == want_italic)
-                return path, exact
-            except Exception:
-                continue
-
-        # Fallbacks: irgendein Nicht-Italic, dann Italic
-        for path, is_bold, is_italic in items:
-            if is_italic:
-                continue
-            try:
-                ImageFont.truetype(path, 12)
-                return path, False
-            except Exception:
-                continue
-        for path, is_bold, is_italic in items:
-            try:
-                ImageFont.truetype(path, 12)
-                return path, False
-            except Exception:
-                continue
-
-        return None, False
+        x, y = xy
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(base.width, x + layer.width), min(base.height, y + layer.height)
+        if x0 >= x1 or y0 >= y1:
+            return base
+
+        if layer.mode != "RGBA":
+            layer = layer.convert("RGBA")
+        base.alpha_composite(layer, dest=(x0, y0), source=(x0 - x, y0 - y, x1 - x, y1 - y))
+        return base
@@ -0,0 +1,78 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable
+
+from src.image.Overlay import Overlay
+
+
+class OverlayRegistry:
+    """
+    Gemeinsamer Cache für Overlay-Templates, Schlüssel ist der Template-Pfad.
+
+    Geparste Templates und ihre dekodierten Assets bleiben im Speicher und
+    werden nur neu geladen, wenn sich die Datei auf der Platte ändert
+    (mtime/Größe); Listener erfahren davon. Überschreitet der geschätzte Speicherbedarf memory_cap,
+    werden die am längsten nicht genutzten Templates verworfen.
+    """
+
+    def __init__(self, memory_cap: int = 256 * 1024 * 1024, target_size=(1772, 1181)):
+        self.memory_cap = int(memory_cap)
+        self.target_size = target_size
+        self._entries: OrderedDict[str, tuple[Overlay, int]] = OrderedDict()   # pfad → (overlay, bytes)
+        # dekodierte data:image-Assets, leben solange ein Overlay sie referenziert
+        self._assets = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """listener(absoluter Pfad) wird aufgerufen, sobald ein Template eine neue Version hat."""
+        self._listeners.append(listener)
+
+    def get(self, overlay_path: str) -> Overlay:
+        key = os.path.abspath(overlay_path)
+        st = os.stat(key)
+        version = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0].version == version:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        # außerhalb des Locks laden: JSON parsen und Assets dekodieren kann dauern
+        overlay = Overlay(overlay_path, target_size=self.target_size, asset_cache=self._assets)
+        overlay.compile(overlay.target_size)
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current[0].version == overlay.version:
+                # paralleler Aufruf war schneller
+                self._entries.move_to_end(key)
+                return current[0]
+            self._entries[key] = (overlay, overlay.memory_usage())
+            self._entries.move_to_end(key)
+            self._evict()
+
+        # erstes Laden ist keine Änderung
+        if current is not None: self._notify(key)
+        return overlay
+
+    def invalidate(self, overlay_path: str):
+        key = os.path.abspath(overlay_path)
+        with self._lock:
+            self._entries.pop(key, None)
+        self._notify(key)
+
+    def _notify(self, key: str):
+        # außerhalb des Locks: Listener dürfen selbst wieder get() aufrufen
+        for listener in list(self._listeners):
+            listener(key)
+
+    def _evict(self):
+        total = sum(size for _, size in self._entries.values())
+        # das zuletzt genutzte Template bleibt immer erhalten
+        while total > self.memory_cap and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            total -= size
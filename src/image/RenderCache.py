@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+if TYPE_CHECKING:
+    from src.PrintJob import PrintJob
+    from src.image.Overlay import Overlay
+
+
+class RenderCache:
+    """
+    Plattencache für druckfertige Bilder (PNG).
+
+    Schlüssel: (Bild-Datei inkl. mtime/Größe, Template + Template-Version,
+    Platzhalter-Werte des Jobs). Ändert sich eines davon, passt der alte
+    Eintrag nicht mehr und wird über das LRU-Limit max_bytes verdrängt.
+    """
+
+    def __init__(self, cache_dir: str = "downloads/rendered", max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes)
+
+        self._entries: OrderedDict[str, int] = OrderedDict()   # dateiname → bytes, LRU-Reihenfolge
+        self._total = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def key(self, job: "PrintJob", overlay_version: str | None = None) -> str | None:
+        """
+        Ohne overlay_version zählt der aktuelle Stand (mtime/Größe) der Template-Datei,
+        so treffen nach dem Bearbeiten des Templates alte Renderings nicht mehr.
+        """
+        try:
+            st = os.stat(job.image_file)
+            if job.overlay_path and overlay_version is None:
+                ost = os.stat(job.overlay_path)
+                overlay_version = f"{ost.st_mtime_ns:x}-{ost.st_size:x}"
+        except OSError:
+            return None
+        raw = "|".join([
+            os.path.abspath(job.image_file), str(st.st_mtime_ns), str(st.st_size),
+            os.path.abspath(job.overlay_path) if job.overlay_path else "",
+            overlay_version or "",
+            str(job.plot), str(job.pc_name),
+        ])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, job: "PrintJob") -> str | None:
+        """Pfad zum druckfertigen Bild, falls für den aktuellen Stand des Jobs vorhanden."""
+        key = self.key(job)
+        if key is None:
+            return None
+        name = key + ".png"
+        path = os.path.join(self.cache_dir, name)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            if not os.path.exists(path):
+                self._total -= self._entries.pop(name)
+                return None
+            self._entries.move_to_end(name)
+        return path
+
+    def put(self, job: "PrintJob", image: Image.Image, overlay: "Overlay | None") -> str | None:
+        """
+        Legt das mit overlay gerenderte Bild ab. Schlüssel ist die Version dieses Overlays:
+        wurde das Template währenddessen geändert, findet get() den Eintrag nicht.
+        """
+        key = self.key(job, None if overlay is None else overlay.version)
+        if key is None:
+            return None
+        name = key + ".png"
+        path = os.path.join(self.cache_dir, name)
+
+        # schnelle Kompression: der Cache ist kurzlebig, Encode-Zeit zählt mehr als Größe
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, format="PNG", compress_level=1)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+            self._entries[name] = os.path.getsize(path)
+            self._total += self._entries[name]
+            self._evict()
+        return path
+
+    def discard(self, job: "PrintJob"):
+        key = self.key(job)
+        if key is None:
+            return
+        name = key + ".png"
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def _load_existing(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(".png") or not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            files.append((st.st_atime, name, st.st_size))
+
+        with self._lock:
+            for _, name, size in sorted(files):
+                self._entries[name] = size
+                self._total += size
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
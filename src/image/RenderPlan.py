@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+from PIL import Image, ImageFont
+
+
+# Platzhalter im Text → Attribut am PrintJob
+PLACEHOLDERS = {
+    "%plotid%": "plot",
+    "%pcname%": "pc_name",
+}
+
+
+@dataclass(frozen=True)
+class NodePlan:
+    """Vorskalierte Geometrie eines Nodes (Zielpixel)."""
+    left: int
+    top: int
+    width: int
+    height: int
+    rotate: int
+    opacity: float
+
+
+@dataclass(frozen=True)
+class ImageNodePlan(NodePlan):
+    image: Image.Image          # dekodiertes RGBA-Asset (Originalgröße)
+    object_fit: str
+
+
+@dataclass(frozen=True)
+class TextNodePlan(NodePlan):
+    text: str                   # Rohtext inkl. Platzhalter
+    placeholders: tuple         # im Text vorkommende Platzhalter
+    font: ImageFont.FreeTypeFont | ImageFont.ImageFont
+    exact_variant: bool
+    want_bold: bool
+    want_italic: bool
+    color: tuple
+    bg: tuple
+    align: str
+    underline: bool
+
+    @property
+    def is_dynamic(self) -> bool:
+        return len(self.placeholders) > 0
+
+    def resolve_text(self, printjob) -> str:
+        text = self.text
+        for placeholder in self.placeholders:
+            text = text.replace(placeholder, str(getattr(printjob, PLACEHOLDERS[placeholder], "")))
+        return text
+
+
+@dataclass(frozen=True)
+class StaticLayer:
+    """Vorab zusammengesetztes Band aufeinanderfolgender statischer Nodes."""
+    image: Image.Image          # RGBA, auf den sichtbaren Inhalt zugeschnitten
+    offset: tuple               # (x, y) auf der Zielfläche
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """
+    Ergebnis von Overlay.compile(): alles, was pro (Template, Zielgröße) nur
+    einmal berechnet werden muss. apply() führt den Plan nur noch aus.
+    """
+    target_size: tuple
+    resize_mode: str
+    bg_layer: Image.Image | None   # Editor-Hintergrund, bereits auf target_size gebracht
+    nodes: tuple                   # NodePlan-Instanzen in z-Reihenfolge
+    layers: tuple                  # StaticLayer-Bänder und dynamische Nodes in z-Reihenfolge
+    scale: float = 1.0             # < 1.0: Entwurfs-/Vorschau-Plan
+    resample: int = Image.LANCZOS
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class LineBox:
+    text: str
+    width: int     # gemessene Breite in px
+    x: int         # horizontaler Versatz gemäß Ausrichtung
+
+
+def _measure(font, text: str) -> float:
+    try:
+        return font.getlength(text)
+    except Exception:
+        bbox = font.getbbox(text)
+        return bbox[2] - bbox[0]
+
+
+@lru_cache(maxsize=1024)
+def layout_text(text: str, font, max_width: int, align: str = "left") -> tuple[LineBox, ...]:
+    """
+    Bricht text in Zeilen um, die max_width nicht überschreiten, und richtet sie aus.
+
+    Jedes Wort wird genau einmal gemessen, die Zeilenbreite wird inkrementell
+    (inkl. Leerzeichen-Vorschub) aufaddiert. Ergebnisse werden nach
+    (text, font, max_width, align) memoisiert; Fonts kommen aus dem
+    FontRegistry-Cache und sind daher als Schlüssel stabil.
+    """
+    space = _measure(font, " ")
+    widths: dict[str, float] = {}
+
+    lines = []
+    for hard_line in text.replace("\r", "").split("\n"):
+        words = []
+        line_w = 0.0
+        for word in hard_line.split(" "):
+            word_w = widths.get(word)
+            if word_w is None:
+                word_w = widths[word] = _measure(font, word)
+
+            # solange die Zeile leer ist, wird das Wort ohne Leerzeichen übernommen
+            if not words or words == [""]:
+                words = [word]
+                line_w = word_w
+            elif line_w + space + word_w <= max_width:
+                words.append(word)
+                line_w += space + word_w
+            else:
+                lines.append((" ".join(words), line_w))
+                words = [word]
+                line_w = word_w
+        lines.append((" ".join(words), line_w))
+
+    boxes = []
+    for line, line_w in lines:
+        width = int(round(line_w))
+        if align == "center":
+            x = (max_width - width) // 2
+        elif align == "right":
+            x = max(0, max_width - width)
+        else:
+            x = 0
+        boxes.append(LineBox(text=line, width=width, x=x))
+    return tuple(boxes)
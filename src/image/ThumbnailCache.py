@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, features
+
+
+class ThumbnailCache:
+    """
+    Kleine Vorschaubilder (WebP, sonst JPEG) für die Job-Listen der Web-Oberfläche.
+
+    Thumbnails werden beim Eingang oder bei der ersten Anfrage erzeugt und auf
+    der Platte abgelegt. Der Schlüssel (= starkes ETag) ergibt sich aus Pfad,
+    mtime und Größe des Originals sowie den Thumbnail-Parametern. Übersteigt der
+    Ordner max_bytes, werden die am längsten nicht genutzten Dateien gelöscht.
+    """
+
+    def __init__(self, cache_dir: str = "downloads/thumbnails", max_bytes: int = 64 * 1024 * 1024,
+                 size=(320, 320), quality: int = 75):
+        # Absolut, da Flask relative Pfade in send_file gegen app.root_path auflöst
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.size = (int(size[0]), int(size[1]))
+        self.quality = int(quality)
+        if features.check("webp"):
+            self.format, self.extension, self.mimetype = "WEBP", ".webp", "image/webp"
+        else:
+            self.format, self.extension, self.mimetype = "JPEG", ".jpg", "image/jpeg"
+
+        self._entries: OrderedDict[str, int] = OrderedDict()   # dateiname → bytes, LRU-Reihenfolge
+        self._total = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def get(self, image_path: str) -> tuple[str, str]:
+        """Liefert (Thumbnail-Pfad, ETag); erzeugt das Thumbnail bei Bedarf."""
+        etag = self._key(image_path)
+        name = etag + self.extension
+        path = os.path.join(self.cache_dir, name)
+
+        with self._lock:
+            if name in self._entries and os.path.exists(path):
+                self._entries.move_to_end(name)
+                return path, etag
+
+        self._render(image_path, path)
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+            self._entries[name] = os.path.getsize(path)
+            self._total += self._entries[name]
+            self._evict()
+        return path, etag
+
+    def generate(self, image_path: str):
+        """Erzeugt das Thumbnail vorab (z.B. direkt nach dem Download)."""
+        self.get(image_path)
+
+    def _key(self, image_path: str) -> str:
+        st = os.stat(image_path)
+        raw = f"{os.path.abspath(image_path)}|{st.st_mtime_ns}|{st.st_size}|{self.size}|{self.quality}|{self.format}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _render(self, image_path: str, out_path: str):
+        with Image.open(image_path) as img:
+            img.draft("RGB", self.size)
+            img.thumbnail(self.size, Image.BILINEAR, reducing_gap=2.0)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+            if self.format == "JPEG" and img.mode == "RGBA":
+                img = img.convert("RGB")
+
+            tmp_path = f"{out_path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, format=self.format, quality=self.quality)
+        os.replace(tmp_path, out_path)
+
+    def _load_existing(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(self.extension) or not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            files.append((st.st_atime, name, st.st_size))
+
+        with self._lock:
+            for _, name, size in sorted(files):
+                self._entries[name] = size
+                self._total += size
+            self._evict()
+
+    def _evict(self):
+        # das zuletzt erzeugte/genutzte Thumbnail bleibt immer erhalten
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
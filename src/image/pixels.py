@@ -0,0 +1,68 @@
+"""
+Vektorisierte Pixel-Operationen (NumPy) für den Druckpfad.
+
+Pillow stellt seinen Puffer nicht beschreibbar bereit; pro Frame wird daher
+genau ein Array gelesen (np.asarray) bzw. ein Zielpuffer angelegt, alle
+Schritte laufen darauf in-place und das Ergebnis wird ohne weitere Kopie
+über Image.fromarray zurückgegeben.
+"""
+import numpy as np
+from PIL import Image
+
+
+WHITE = (255, 255, 255)
+
+
+def apply_opacity(img: Image.Image, opacity: float) -> Image.Image:
+    """Skaliert den Alphakanal mit opacity (0..1)."""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    arr = np.array(img)
+    alpha = arr[..., 3]
+    np.multiply(alpha, max(0.0, min(1.0, float(opacity))), out=alpha, casting="unsafe")
+    return Image.fromarray(arr, "RGBA")
+
+
+def _flatten_into(out: np.ndarray, rgba: np.ndarray, bg=WHITE):
+    """
+    Blendet rgba (H×W×4, nicht vormultipliziert) über eine deckende Hintergrundfarbe
+    und schreibt das RGB-Ergebnis nach out (H×W×3):
+        out = rgb * a + bg * (1 - a)   ≙   premultiplied(rgb) + bg * (1 - a)
+    """
+    alpha = rgba[..., 3:4].astype(np.uint16)
+    inv = 255 - alpha
+    acc = rgba[..., :3] * alpha                                     # vormultiplizierte Farbe
+    acc += np.asarray(bg, dtype=np.uint16) * inv
+    acc += 127                                                      # runden
+    np.floor_divide(acc, 255, out=acc)
+    out[...] = acc
+
+
+def flatten_onto_white(img: Image.Image) -> Image.Image:
+    """RGBA → RGB auf weißem Hintergrund."""
+    return flatten_and_pad(img, 0, 0)
+
+
+def flatten_and_pad(img: Image.Image, x_pad: int, y_pad: int, bg=WHITE) -> Image.Image:
+    """
+    Fügt einen Rand (x_pad links/rechts, y_pad oben/unten) in Farbe bg hinzu und
+    bringt das Bild dabei auf RGB; Transparenz wird auf bg verrechnet.
+    Ein einziger Zielpuffer, kein Zwischenbild.
+    """
+    if x_pad < 0 or y_pad < 0:
+        raise ValueError("xAbstand und yAbstand müssen >= 0 sein")
+
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+    w, h = img.size
+    out = np.empty((h + 2 * y_pad, w + 2 * x_pad, 3), dtype=np.uint8)
+    out[...] = bg
+    inner = out[y_pad:y_pad + h, x_pad:x_pad + w]
+
+    src = np.asarray(img)
+    if img.mode == "RGBA":
+        _flatten_into(inner, src, bg)
+    else:
+        inner[...] = src
+    return Image.fromarray(out, "RGB")
@@ -5,6 +5,8 @@ import win32gui
 import win32print
 from PIL import Image
 
+from src.image import pixels
+
 def print_image(image: Image.Image, printer_name: str, print_title: str):
     image = _ensure_rgb(image)
 
@@ -108,9 +110,7 @@ def _ensure_rgb(img: Image.Image) -> Image.Image:
     if img.mode not in ("RGB", "RGBA", "L"):
         return img.convert("RGB")
     if img.mode == "RGBA":
-        bg = Image.new("RGB", img.size, (255, 255, 255))
-        bg.paste(img, mask=img.split()[-1])
-        return bg
+        return pixels.flatten_onto_white(img)
     if img.mode == "L":
         return img.convert("RGB")
     return img
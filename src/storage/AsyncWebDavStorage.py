@@ -0,0 +1,249 @@
+import asyncio
+import base64
+import collections
+import ssl
+import threading
+import xml.etree.ElementTree as ET
+from urllib import parse
+
+from owncloud import FileInfo
+
+from src.storage.RemoteStorage import RemoteStorage, RemoteStorageError
+
+PROPFIND_ETAG = b'<?xml version="1.0"?><d:propfind xmlns:d="DAV:"><d:prop><d:getetag/></d:prop></d:propfind>'
+
+
+class _Response:
+    def __init__(self, status: int, headers: dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class _Connection:
+    """
+    One HTTP/1.1 keep-alive connection. Requests are written as soon as they arrive
+    (pipelining, up to `depth` unanswered requests); a reader task matches the
+    responses to the waiting requests in order.
+    """
+
+    def __init__(self, host: str, port: int, use_ssl: bool, depth: int):
+        self.host, self.port, self.use_ssl = host, port, use_ssl
+        self.depth = asyncio.Semaphore(depth)
+        self.send_lock = asyncio.Lock()
+        self.pending: collections.deque[tuple[str, asyncio.Future]] = collections.deque()
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.reader_task: asyncio.Task | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def request(self, method: str, target: str, headers: dict[str, str], body: bytes = b"") -> _Response:
+        async with self.depth:
+            async with self.send_lock:
+                if not self.is_open:
+                    await self._open()
+                head = [f"{method} {target} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+                head += [f"{k}: {v}" for k, v in headers.items()]
+                future = asyncio.get_running_loop().create_future()
+                self.pending.append((method, future))
+                # The reader only runs while responses are outstanding
+                if self.reader_task is None or self.reader_task.done():
+                    self.reader_task = asyncio.create_task(self._read_responses(self.reader, self.writer))
+                try:
+                    self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                    await self.writer.drain()
+                except (ConnectionError, OSError):
+                    # Nothing will answer this request; later responses must not be matched to it.
+                    # Closing makes the reader fail the requests still in flight on this connection.
+                    self.pending.remove((method, future))
+                    self.writer.close()
+                    future.cancel()
+                    raise
+            return await future
+
+    async def _open(self):
+        context = ssl.create_default_context() if self.use_ssl else None
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while self.pending:
+                method, future = self.pending[0]
+                response = await self._read_response(reader, method)
+                self.pending.popleft()
+                if not future.done(): future.set_result(response)
+                if response.headers.get("connection", "").lower() == "close":
+                    raise ConnectionError("Connection closed by server")
+        except (ConnectionError, asyncio.IncompleteReadError, OSError, ValueError) as e:
+            writer.close()
+            self._fail_pending(e)
+
+    def _fail_pending(self, error: Exception):
+        while self.pending:
+            _, future = self.pending.popleft()
+            if not future.done(): future.set_exception(ConnectionError(str(error)))
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, method: str) -> _Response:
+        status_line = await reader.readline()
+        if not status_line: raise ConnectionError("Connection closed by server")
+        status = int(status_line.split(b" ", 2)[1])
+
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while await reader.readline() not in (b"\r\n", b"\n", b""): pass   # trailer
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return _Response(status, headers, body)
+
+    async def close(self):
+        if self.writer is not None: self.writer.close()
+        if self.reader_task is not None: self.reader_task.cancel()
+
+
+class AsyncWebDavStorage(RemoteStorage):
+    """
+    WebDAV backend on an asyncio event loop in its own thread. Every call from a worker
+    thread becomes a coroutine on that loop; requests are spread over a few keep-alive
+    connections and pipelined on each, so listings, downloads and deletes overlap
+    without a connection per request.
+    """
+
+    TIMEOUT = 60
+    # Servers close keep-alive connections after a number of requests; pipelined requests behind that are resent
+    RETRIES = 3
+
+    def __init__(self, url: str, connections: int = 2, pipeline_depth: int = 8):
+        if not url.endswith("/"): url += "/"
+        self.url = parse.urlparse(url)
+        self.connections_count = max(1, connections)
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.auth_header = ""
+        self.dav_path = ""
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="AsyncWebDav", daemon=True)
+        self.thread.start()
+        self.connections: list[_Connection] = self._call(self._create_connections())
+
+    async def _create_connections(self) -> list[_Connection]:
+        use_ssl = self.url.scheme == "https"
+        port = self.url.port or (443 if use_ssl else 80)
+        return [_Connection(self.url.hostname, port, use_ssl, self.pipeline_depth) for _ in range(self.connections_count)]
+
+    # ========= RemoteStorage ========= #
+    def login(self, username: str, password: str):
+        self.auth_header = "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+        self.dav_path = self.url.path + "remote.php/dav/files/" + parse.quote(username)
+        # Checks credentials and dav path in one request
+        self._call(self._propfind("/", depth=0))
+
+    def list_folder(self, folder: str) -> list[FileInfo]:
+        if not folder.endswith("/"): folder += "/"
+        return self._call(self._propfind(folder, depth=1))[1:]
+
+    def folder_etag(self, folder: str) -> str | None:
+        try:
+            items = self._call(self._propfind(folder, depth=0, body=PROPFIND_ETAG))
+        except RemoteStorageError:
+            return None
+        return items[0].attributes.get("{DAV:}getetag") if items else None
+
+    def exists(self, path: str) -> bool:
+        try:
+            self._call(self._propfind(path, depth=0))
+            return True
+        except RemoteStorageError:
+            return False
+
+    def mkdir(self, path: str) -> bool:
+        if not path.endswith("/"): path += "/"
+        self._check(self._call(self._request("MKCOL", path)), path, (201,))
+        return True
+
+    def get_file_contents(self, path: str) -> bytes:
+        response = self._call(self._request("GET", path))
+        return self._check(response, path, (200,)).body
+
+    def delete(self, path: str | FileInfo) -> bool:
+        return self._call(self._delete(path))
+
+    def delete_many(self, paths: list[str | FileInfo]) -> list[bool]:
+        async def delete_all():
+            results = await asyncio.gather(*(self._delete(p) for p in paths), return_exceptions=True)
+            return [r is True or self._is_not_found(r) for r in results]
+        return self._call(delete_all())
+
+    def close(self):
+        async def close_all():
+            for connection in self.connections: await connection.close()
+        try:
+            self._call(close_all())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # ========= Requests ========= #
+    async def _delete(self, path: str | FileInfo) -> bool:
+        path = path.path if isinstance(path, FileInfo) else path
+        self._check(await self._request("DELETE", path), path, (200, 204))
+        return True
+
+    async def _propfind(self, path: str, depth: int, body: bytes = b"") -> list[FileInfo]:
+        headers = {"Depth": str(depth)}
+        if body: headers["Content-Type"] = "application/xml; charset=utf-8"
+        response = self._check(await self._request("PROPFIND", path, headers, body), path, (207,))
+        return [self._parse_dav_element(element) for element in ET.fromstring(response.body)]
+
+    async def _request(self, method: str, path: str, headers: dict[str, str] | None = None, body: bytes = b"") -> _Response:
+        if not path.startswith("/"): path = "/" + path
+        target = self.dav_path + parse.quote(path)
+        headers = {"Authorization": self.auth_header, **(headers or {})}
+
+        # All used methods are idempotent: requests lost with a closed connection are sent again
+        for attempt in range(self.RETRIES + 1):
+            connection = min(self.connections, key=lambda c: (len(c.pending), not c.is_open))
+            try:
+                return await connection.request(method, target, headers, body)
+            except (ConnectionError, OSError) as e:
+                if attempt == self.RETRIES: raise RemoteStorageError(f"{method} {path} failed: {e}") from e
+
+    @staticmethod
+    def _check(response: _Response, path: str, expected: tuple[int, ...]) -> _Response:
+        if response.status in expected: return response
+        raise RemoteStorageError(f"{path}: HTTP {response.status}", response.status)
+
+    def _parse_dav_element(self, element: ET.Element) -> FileInfo:
+        href = parse.unquote(parse.urlparse(element.find("{DAV:}href").text).path)
+        if href.startswith(self.dav_path): href = href[len(self.dav_path):]
+
+        attributes = {}
+        for propstat in element.findall("{DAV:}propstat"):
+            status = propstat.findtext("{DAV:}status", "")
+            if " 200 " not in status: continue
+            for attr in propstat.find("{DAV:}prop"):
+                attributes[attr.tag] = attr.text
+        return FileInfo(href, "dir" if href.endswith("/") else "file", attributes)
+
+    def _call(self, coro):
+        """Runs a coroutine on the storage loop and waits for its result."""
+        try:
+            return asyncio.run_coroutine_threadsafe(coro, self.loop).result(self.TIMEOUT)
+        except TimeoutError as e:
+            raise RemoteStorageError("Request timed out") from e
@@ -0,0 +1,66 @@
+import owncloud
+import requests
+from owncloud import FileInfo
+from requests.adapters import HTTPAdapter
+
+from src.storage.RemoteStorage import RemoteStorage, RemoteStorageError
+
+
+class OwncloudStorage(RemoteStorage):
+    """
+    Blocking backend on top of pyocclient. Every calling thread gets its own
+    keep-alive connection from a shared pool of pool_size connections.
+    """
+
+    def __init__(self, url: str, pool_size: int = 4):
+        self.oc = owncloud.Client(url)
+        self.pool_size = pool_size
+
+    def login(self, username: str, password: str):
+        try:
+            self.oc.login(username, password)
+        except owncloud.ResponseError as e:
+            raise RemoteStorageError("Login failed: " + str(e), e.status_code) from e
+        except requests.RequestException as e:
+            raise RemoteStorageError("Login failed: " + str(e), None) from e
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.oc._session.mount("https://", adapter)
+        self.oc._session.mount("http://", adapter)
+
+    def list_folder(self, folder: str) -> list[FileInfo]:
+        return self._call(self.oc.list, folder) or []
+
+    def folder_etag(self, folder: str) -> str | None:
+        try:
+            info = self._call(self.oc.file_info, folder, ["d:getetag"])
+        except RemoteStorageError as e:
+            if e.status_code is None: raise
+            return None
+        return info.attributes.get("{DAV:}getetag") if info else None
+
+    def exists(self, path: str) -> bool:
+        try:
+            self._call(self.oc.file_info, path)
+            return True
+        except RemoteStorageError as e:
+            if e.status_code is None: raise
+            return False
+
+    def mkdir(self, path: str) -> bool:
+        return bool(self._call(self.oc.mkdir, path))
+
+    def get_file_contents(self, path: str) -> bytes:
+        return self._call(self.oc.get_file_contents, path)
+
+    def delete(self, path: str | FileInfo) -> bool:
+        return bool(self._call(self.oc.delete, path))
+
+    @staticmethod
+    def _call(method, *args):
+        try:
+            return method(*args)
+        except owncloud.ResponseError as e:
+            raise RemoteStorageError(str(e), e.status_code) from e
+        except requests.RequestException as e:
+            raise RemoteStorageError(str(e), None) from e
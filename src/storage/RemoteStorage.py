@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from owncloud import FileInfo
+
+if TYPE_CHECKING:
+    from src.Config import Config
+
+
+class RemoteStorageError(Exception):
+    """Raised by storage backends for failed requests (HTTP error status or connection failure)."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RemoteStorage(ABC):
+    """
+    The subset of WebDAV operations the NextcloudFetcherThread needs.
+    Files are described by owncloud.FileInfo for every backend.
+    All methods may be called from several threads at once.
+    """
+
+    @abstractmethod
+    def login(self, username: str, password: str): ...
+
+    @abstractmethod
+    def list_folder(self, folder: str) -> list[FileInfo]: ...
+
+    @abstractmethod
+    def folder_etag(self, folder: str) -> str | None:
+        """ETag of a folder (depth-0 PROPFIND), None if it could not be determined."""
+
+    @abstractmethod
+    def exists(self, path: str) -> bool: ...
+
+    @abstractmethod
+    def mkdir(self, path: str) -> bool: ...
+
+    @abstractmethod
+    def get_file_contents(self, path: str) -> bytes: ...
+
+    @abstractmethod
+    def delete(self, path: str | FileInfo) -> bool: ...
+
+    def delete_many(self, paths: list[str | FileInfo]) -> list[bool]:
+        """
+        Deletes several files; backends that can pipeline requests override this.
+        :return: Per path whether the file is gone afterwards (a missing file counts as deleted)
+        """
+        results = []
+        for path in paths:
+            try:
+                results.append(bool(self.delete(path)))
+            except RemoteStorageError as e:
+                results.append(self._is_not_found(e))
+        return results
+
+    @staticmethod
+    def _is_not_found(error) -> bool:
+        return isinstance(error, RemoteStorageError) and error.status_code == 404
+
+    def close(self):
+        pass
+
+
+def create_remote_storage(config: "Config") -> RemoteStorage:
+    """Builds the backend selected by nc_backend ("owncloud" or "async")."""
+    if config.nc_backend == "async":
+        from src.storage.AsyncWebDavStorage import AsyncWebDavStorage
+        return AsyncWebDavStorage(config.nc_url, config.nc_connections, config.nc_pipeline_depth)
+
+    from src.storage.OwncloudStorage import OwncloudStorage
+    # download workers + listing + cleanup thread
+    return OwncloudStorage(config.nc_url, config.nc_download_workers + 2)
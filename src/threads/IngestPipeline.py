@@ -0,0 +1,121 @@
+import itertools
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestItem:
+    """One file travelling through the pipeline; stages fill in their fields."""
+    seq: int
+    source: Any
+    sidecar: Any = None
+    data: bytes | None = None
+    raw_metadata: bytes | None = None
+    name: str | None = None
+    image_file: str | None = None
+    job: Any = None
+    failed: bool = False
+
+
+class Stage:
+    """
+    A bounded queue with its own worker threads. put() blocks while the queue is full,
+    so a slow stage holds back the stages feeding it instead of piling up work.
+    """
+
+    def __init__(self, pipeline: "IngestPipeline", name: str, handler: Callable[[IngestItem], None], workers: int, maxsize: int,
+                 handle_failed: bool = False):
+        self.pipeline = pipeline
+        self.name = name
+        self.handler = handler
+        self.handle_failed = handle_failed
+        self.queue: queue.Queue[IngestItem] = queue.Queue(maxsize)
+        self.threads = [threading.Thread(target=self._work, name=f"{pipeline.name}-{name}-{i}", daemon=True) for i in range(max(1, workers))]
+        self.next: Stage | None = None
+
+    def put(self, item: IngestItem):
+        while not self.pipeline.stopped:
+            try:
+                self.queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _work(self):
+        while not self.pipeline.stopped:
+            try:
+                item = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            if not item.failed or self.handle_failed:
+                try:
+                    self.handler(item)
+                except Exception:
+                    logger.exception("Error in ingest stage %s for %s", self.name, item.source)
+                    item.failed = True
+
+            # Failed items skip the remaining work but still reach the sink to keep the order going
+            self.pipeline.forward(self, item)
+
+
+class IngestPipeline:
+    """
+    Chain of stages ending in an ordered sink. Items are numbered on submit and
+    handed to the sink in that order, regardless of which stage workers finish first;
+    a failed item is passed on as a gap and does not hold back the ones behind it.
+    """
+
+    def __init__(self, name: str, sink: Callable[[IngestItem], None], queue_size: int = 16):
+        self.name = name
+        self.sink = sink
+        self.queue_size = queue_size
+        self.stopped = False
+        self.stages: list[Stage] = []
+
+        self._seq = itertools.count()
+        self._reorder: dict[int, IngestItem] = {}
+        self._next_seq = 0
+        self._sink_stage = Stage(self, "enqueue", self._reorder_and_sink, 1, queue_size, handle_failed=True)
+
+    def add_stage(self, name: str, handler: Callable[[IngestItem], None], workers: int) -> "IngestPipeline":
+        stage = Stage(self, name, handler, workers, self.queue_size)
+        if self.stages: self.stages[-1].next = stage
+        self.stages.append(stage)
+        return self
+
+    def submit(self, source, sidecar=None) -> IngestItem:
+        """Blocks while the first stage is full."""
+        item = IngestItem(next(self._seq), source, sidecar)
+        (self.stages[0] if self.stages else self._sink_stage).put(item)
+        return item
+
+    def forward(self, stage: Stage, item: IngestItem):
+        if stage is self._sink_stage: return
+        if item.failed or stage.next is None:
+            self._sink_stage.put(item)
+        else:
+            stage.next.put(item)
+
+    def _reorder_and_sink(self, item: IngestItem):
+        # Only the single enqueue worker touches the reorder buffer
+        self._reorder[item.seq] = item
+        while self._next_seq in self._reorder:
+            ready = self._reorder.pop(self._next_seq)
+            self._next_seq += 1
+            try:
+                self.sink(ready)
+            except Exception:
+                logger.exception("Error in ingest sink for %s", ready.source)
+
+    def start(self):
+        for stage in self.stages + [self._sink_stage]:
+            for thread in stage.threads: thread.start()
+
+    def stop(self):
+        self.stopped = True
@@ -1,168 +1,256 @@
-import json
-import os
 import threading
 import time
 import uuid
-import owncloud
 from typing import TYPE_CHECKING
-from datetime import datetime
-from PIL import Image
-from owncloud import FileInfo, ResponseError
+from datetime import datetime, timezone
+from PIL import UnidentifiedImageError
+from owncloud import FileInfo
+from src.Ingestor import DuplicateImage
 from src.PrintJob import PrintJob
+from src.storage.RemoteStorage import RemoteStorageError, create_remote_storage
+from src.threads.IngestPipeline import IngestPipeline, IngestItem
+from src.threads.RemoteCleanupThread import RemoteCleanupThread
 
 if TYPE_CHECKING:
     from src.PrintManager import PrintManager
 
 class NextcloudFetcherThread(threading.Thread):
-    IMAGES_FOLDER = "downloads/images/"
-    METADATA_FOLDER = "downloads/metadata/"
-    TEMP_FOLDER = "downloads/temp/"
-
     DELETE_METADATA_FILES = True
+    # Seconds after its upload an image waits for a sidecar that has not arrived yet
+    SIDECAR_GRACE = 10.0
+    # Factor the polling interval grows by per idle cycle
+    POLL_BACKOFF = 1.5
 
     def __init__(self, state: "PrintManager"):
         super().__init__(name="NextcloudFetcherThread")
         self.state = state
         self.config = state.config
         self.is_running = False
+        # Images held back for their sidecar → local time they were first seen
+        self.waiting_for_sidecar: dict[str, float] = {}
+        self.wakeup = threading.Event()
+
+        # Change detection: ETag of the images folder after the last cycle that found it empty
+        self.images_etag: str | None = None
+        self.check_interval: float = self.config.nc_check_time_min
+
+        self.storage = create_remote_storage(self.config)
+        self.cleanup = RemoteCleanupThread(state, self.storage)
 
-        self.oc = owncloud.Client("https://storage.canstein-berlin.de")
+        # Images handed to the pipeline and not yet enqueued, by remote name
+        self.in_flight: set[str] = set()
+        self.in_flight_lock = threading.Lock()
+
+        # listing (this thread) → download → decode → metadata → enqueue (arrival order)
+        self.pipeline = IngestPipeline("NextcloudIngest", self._enqueue, self.config.ingest_queue_size)
+        self.pipeline.add_stage("download", self._download, self.config.nc_download_workers)
+        self.pipeline.add_stage("decode", self._decode, self.config.ingest_decode_workers)
+        self.pipeline.add_stage("metadata", self._merge_metadata, 1)
 
     def run(self):
         self.is_running = True
-        self.oc.login(self.config.nc_username, self.config.nc_password)
+        self.storage.login(self.config.nc_username, self.config.nc_password)
+        self.pipeline.start()
 
         self._create_base_folders()
-        self._clear_files_from_last_day(self.config.nc_images_folder)
-        self._clear_files_from_last_day(self.config.nc_metadata_folder)
+        # Also removes the files from last day, without holding back the first fetch
+        self.cleanup.start()
 
         while self.is_running:
-            time.sleep(self.config.nc_check_time)
-            self.fetch_files()
+            self.wakeup.wait(self.check_interval)
+            if not self.is_running: break
+            try:
+                self.poll()
+            except RemoteStorageError:
+                # Nextcloud unreachable: try again after the longest interval
+                self.state.app.logger.exception("Error polling the nextcloud")
+                self.images_etag = None
+                self.check_interval = self.config.nc_check_time_max
+
+    def poll(self):
+        """
+        One polling cycle. A depth-0 PROPFIND on the images folder decides whether a full
+        listing is necessary. The interval drops to nc_check_time_min after activity and
+        backs off towards nc_check_time_max while idle.
+        """
+        etag = self.storage.folder_etag(self.config.nc_images_folder)
+        if etag is not None and etag == self.images_etag and not self.waiting_for_sidecar:
+            self.check_interval = min(self.config.nc_check_time_max, self.check_interval * self.POLL_BACKOFF)
+            return
+
+        found, left = self.fetch_files()
+
+        # Only an empty folder is remembered. Files left behind (in flight, failed, not
+        # deleted) have to be listed again, their outcome does not change the ETag
+        self.images_etag = etag if left == 0 else None
+        if found > 0:
+            self.check_interval = self.config.nc_check_time_min
+        else:
+            self.check_interval = min(self.config.nc_check_time_max, self.check_interval * self.POLL_BACKOFF)
 
-    def fetch_files(self):
+        # Look again once the first held-back image runs out of grace
+        if self.waiting_for_sidecar:
+            remaining = min(self.waiting_for_sidecar.values()) + self.SIDECAR_GRACE - time.monotonic()
+            self.check_interval = min(self.check_interval, max(0.5, remaining))
+
+    def fetch_files(self) -> tuple[int, int]:
         """
-        Fetches all new files from the nextcloud.
+        Lists the nextcloud and hands new files to the ingest pipeline in arrival order.
+        Blocks only while the download stage is full.
+        :return: Number of new images handed to the pipeline, number of files left in the folder
         """
         self.state.log("Fetching files...")
-        files = self.oc.list(self.config.nc_images_folder)
+        files = self.storage.list_folder(self.config.nc_images_folder)
         if len(files) != 0: print("Files: " + str(files))
+
+        images = []
+        left = 0
         for file in files:
-            print("#####################################")
             name = file.get_name()
-            print("File: " + str(name))
+            if self.cleanup.is_expired(file):
+                continue
+            left += 1
+            if self.cleanup.is_pending(file.path):
+                continue
             if not name.endswith(".jpg") and not name.endswith(".png"):
-                self.oc.delete(file)
+                self.cleanup.schedule([file.path])
                 continue
-            new_file_name = str(uuid.uuid4())
+            images.append(file)
+        images.sort(key=self._arrival_time)
 
-            # Download Image
-            downloaded_image = self.download_image_to_png(file, new_file_name)
-            if not self.oc.delete(file):
-                self.state.log("Failed to delete file: " + str(file))
+        with self.in_flight_lock:
+            new_images = [file for file in images if file.get_name() not in self.in_flight]
 
-            metadata, nc_metadata_filename = self.check_and_download_metadata(file, new_file_name)
-            if self.DELETE_METADATA_FILES and len(nc_metadata_filename) > 1: self.oc.delete(nc_metadata_filename)
+        sidecars = self._list_sidecars() if new_images else {}
+        for file in new_images:
+            sidecar = sidecars.get(self._sidecar_name(file))
+            if sidecar is None and self._wait_for_sidecar(file):
+                continue
+            self.waiting_for_sidecar.pop(file.get_name(), None)
+            with self.in_flight_lock:
+                self.in_flight.add(file.get_name())
+            self.pipeline.submit(file, sidecar)
 
-            self.state.add_new_job(PrintJob(new_file_name, downloaded_image, metadata))
+        # Forget images that disappeared while waiting
+        names = {file.get_name() for file in images}
+        for name in list(self.waiting_for_sidecar):
+            if name not in names: del self.waiting_for_sidecar[name]
 
-    def check_and_download_metadata(self, image_file: FileInfo, new_file_name: str) -> (dict, str):
-        """
-        Downloads the corresponding metadata file if it exists and parses it's content
-        :param image_file: The image file that corresponds to the metadata file
-        :param new_file_name:
-        :return: Parsed Metadata
-        """
-        name_to_check_for = ".".join(image_file.get_name().split(".")[:-1]) + ".json"
-        path_to_check_for = self.config.nc_metadata_folder + name_to_check_for
+        return len(new_images), left
 
-        print(path_to_check_for)
+    # ========= Pipeline stages ========= #
+    def _download(self, item: IngestItem):
+        """Network stage: fetches the image and its sidecar."""
+        print("File: " + str(item.source.get_name()))
+        self.state.log("Downloading file...")
+        item.data = self.storage.get_file_contents(item.source.path)
+        item.raw_metadata = self.download_metadata(item.sidecar)
 
-        if not self._file_exists(path_to_check_for): return {}, ""
+    def _decode(self, item: IngestItem):
+        """CPU stage: validates the image, stores it locally and renders the thumbnail."""
+        item.name = str(uuid.uuid4())
+        data, item.data = item.data, None
+        try:
+            item.image_file = self.state.ingestor.store_image_bytes(data, item.name)
+        except UnidentifiedImageError:
+            self.state.log("Not a valid image, deleting: " + str(item.source.get_name()))
+            self.cleanup.schedule([item.source.path])
+            item.failed = True
+            return
+        except DuplicateImage as e:
+            self.state.log(f"Duplicate of job {e.job_uuid}, dropping: {item.source.get_name()}")
+            self.cleanup.schedule(self._remote_files(item))
+            item.failed = True
+            return
+        self.state.ingestor.generate_thumbnail(item.image_file)
 
-        print("File Exists")
+    def _merge_metadata(self, item: IngestItem):
+        """Attaches the parsed sidecar to the job."""
+        metadata = self.state.ingestor.parse_metadata(item.raw_metadata, item.sidecar.path) if item.sidecar is not None else {}
+        item.job = PrintJob(item.name, item.image_file, metadata)
 
-        self._download_file(path_to_check_for, new_file_name + ".json", self.METADATA_FOLDER)
+    def _enqueue(self, item: IngestItem):
+        """Sink, called in arrival order. Remote files are deleted once the job is stored locally."""
+        if not item.failed and item.job is not None:
+            self.state.add_new_job(item.job)
+            self.cleanup.schedule(self._remote_files(item))
 
-        return self._parse_metadata(self.METADATA_FOLDER + new_file_name + ".json"), path_to_check_for
+        with self.in_flight_lock:
+            self.in_flight.discard(item.source.get_name())
 
+    def _remote_files(self, item: IngestItem) -> list[str]:
+        remote_files = [item.source.path]
+        if self.DELETE_METADATA_FILES and item.sidecar is not None: remote_files.append(item.sidecar.path)
+        return remote_files
 
-    def download_image_to_png(self, file: FileInfo, new_name: str) -> str:
+    def download_metadata(self, sidecar: FileInfo | None) -> bytes | None:
         """
-        Downloads an image file to the temp folder and converts it to PNG.
-        The converted file will be saved under a new name in the images folder
-        :param file: The Nextcloud file to download
-        :param new_name: The new filename
-        :return: The path to the downloaded image
+        Downloads the metadata file found in the listing (if any)
+        :param sidecar: The metadata file that corresponds to the image, None if there is none
+        :return: The raw metadata or None
         """
-        if not os.path.exists(self.TEMP_FOLDER): os.makedirs(self.TEMP_FOLDER)
+        if sidecar is None: return None
 
-        self._download_file(file.path, file.get_name(), self.TEMP_FOLDER)
-        image = Image.open(self.TEMP_FOLDER + file.get_name())
-        image.save(self.IMAGES_FOLDER + new_name + ".png")
-        os.remove(self.TEMP_FOLDER + file.get_name())
-        return self.IMAGES_FOLDER + new_name + ".png"
-
-    def _parse_metadata(self, metadata_file):
-        if len(metadata_file) == 0: return {}
         try:
-            with open(metadata_file, "r") as f:
-                data = json.load(f)
-                data["metadata_path"] = metadata_file
-                return data
-        except Exception as e:
-            self.state.app.logger.exception("Error loading Metadata!, Skipping " + metadata_file)
-        return {}
-
-    def _download_file(self, file: FileInfo | str, filename: str, download_folder: str):
-        self.state.log("Downloading file...")
-        if not os.path.exists(download_folder):
-            os.makedirs(download_folder)
+            return self.storage.get_file_contents(sidecar.path)
+        except RemoteStorageError as e:
+            print(e)
+            return None
 
+    def _list_sidecars(self) -> dict[str, FileInfo]:
+        """
+        Lists the metadata folder once per polling cycle.
+        :return: Metadata files by name
+        """
         try:
-            path = file
-            if isinstance(file, FileInfo):
-                path = file.path
+            return {f.get_name(): f for f in self.storage.list_folder(self.config.nc_metadata_folder) if not f.is_dir()}
+        except RemoteStorageError:
+            self.state.app.logger.exception("Error listing metadata folder")
+            return {}
 
-            self.oc.get_file(path, download_folder + filename)
-        except ResponseError as e:
-            print(e)
-
-    def _file_exists(self, filename):
+    def _wait_for_sidecar(self, file: FileInfo) -> bool:
+        """
+        Sidecars may be uploaded shortly after their image. Only images uploaded less than
+        SIDECAR_GRACE seconds ago are kept back, and for at most SIDECAR_GRACE seconds
+        measured locally (the server clock may be off).
+        :return: True if the image should be skipped in this cycle
+        """
         try:
-            self.oc.file_info(filename)
-            return True
-        except owncloud.HTTPResponseError:
+            # pyocclient returns naive UTC timestamps
+            age = (datetime.now(timezone.utc).replace(tzinfo=None) - file.get_last_modified()).total_seconds()
+        except (KeyError, ValueError):
             return False
+        if age >= self.SIDECAR_GRACE:
+            return False
+
+        first_seen = self.waiting_for_sidecar.setdefault(file.get_name(), time.monotonic())
+        return time.monotonic() - first_seen < self.SIDECAR_GRACE
+
+    @staticmethod
+    def _sidecar_name(file: FileInfo) -> str:
+        return ".".join(file.get_name().split(".")[:-1]) + ".json"
+
 
     def _create_base_folders(self):
         self.state.log("Creating base folders... " + str(threading.current_thread().ident))
-        if not self._file_exists(self.config.nc_images_folder):
-            self.oc.mkdir(self.config.nc_images_folder)
+        if not self.storage.exists(self.config.nc_images_folder):
+            self.storage.mkdir(self.config.nc_images_folder)
             self.state.log("Successfully created folder: " + self.config.nc_images_folder)
 
-        if not self._file_exists(self.config.nc_metadata_folder):
-            self.oc.mkdir(self.config.nc_metadata_folder)
+        if not self.storage.exists(self.config.nc_metadata_folder):
+            self.storage.mkdir(self.config.nc_metadata_folder)
             self.state.log("Successfully created folder: " + self.config.nc_metadata_folder)
 
-    def _clear_files_from_last_day(self, folder: str):
-        self.state.log("Clearing files from last day")
-        files = self.oc.list(folder)
-        for file in files:
-            file_time = file.get_last_modified()
-            adjusted_file_time = self._datetime_to_utc(file_time)
-            current_time = datetime.now()
-            if(current_time - adjusted_file_time).days >= 1:
-                deleted = self.oc.delete(file)
-                if deleted:
-                    self.state.log("Deleted file: " + file.get_name())
-                else: self.state.log("Error deleting file: " + file.get_name())
-
     def stop(self):
         self.is_running = False
+        self.wakeup.set()
+        self.pipeline.stop()
+        self.cleanup.stop()
+        self.storage.close()
 
     @staticmethod
-    def _datetime_to_utc(utc_datetime):
-        now_timestamp = time.time()
-        offset = datetime.fromtimestamp(now_timestamp) - datetime.utcfromtimestamp(now_timestamp)
-        return utc_datetime + offset
\ No newline at end of file
+    def _arrival_time(file: FileInfo):
+        try:
+            return file.get_last_modified()
+        except (KeyError, ValueError):
+            return datetime.max
@@ -0,0 +1,77 @@
+import os
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+from src.JobStore import JobStore
+from src.PrintJob import PrintJob
+
+if TYPE_CHECKING:
+    from src.PrintManager import PrintManager
+
+
+class PrerenderThread(threading.Thread):
+    """
+    Renders queued jobs (overlay, padding, PNG encode) into the RenderCache
+    ahead of time, so the PrinterThread only has to submit finished files.
+    Pending jobs are rendered again when their overlay template changes.
+    """
+
+    def __init__(self, pm: "PrintManager"):
+        super().__init__(name="PrerenderThread", daemon=True)
+        self.pm = pm
+        self.stopped = False
+        self.jobs: queue.Queue[PrintJob] = queue.Queue()
+        pm.overlays.add_listener(self.on_overlay_changed)
+
+    def submit(self, job: PrintJob):
+        self.jobs.put(job)
+
+    def on_overlay_changed(self, overlay_path: str):
+        """The cached renders of jobs using the template no longer match, render them again."""
+        for job in self._prerendered_jobs():
+            if os.path.abspath(job.overlay_path or self.pm.DEFAULT_OVERLAY) == overlay_path:
+                self.submit(job)
+
+    def check_overlays(self):
+        """While idle, lets the registry notice edited templates of pending jobs (one stat per template)."""
+        for path in {job.overlay_path or self.pm.DEFAULT_OVERLAY for job in self._prerendered_jobs()}:
+            try:
+                self.pm.overlays.get(path)
+            except Exception:
+                continue   # reported when the job is rendered
+
+    def _prerendered_jobs(self) -> list[PrintJob]:
+        jobs = self.pm.jobs.jobs(JobStore.QUEUE)
+        if self.pm.config.prerender_unlisted: jobs += self.pm.jobs.jobs(JobStore.UNLISTED)
+        return jobs
+
+    def run(self):
+        while not self.stopped:
+            try:
+                job = self.jobs.get(timeout=1)
+            except queue.Empty:
+                self.check_overlays()
+                continue
+
+            # Job is already printing or gone
+            if job is self.pm.current_print_job or not self.pm.is_pending(job):
+                continue
+
+            self.render(job)
+
+    def render(self, job: PrintJob) -> str | None:
+        if self.pm.render_cache.get(job) is not None:
+            return None
+        try:
+            overlay = self.pm.overlay_for(job)
+            image = job.open_and_preprocess_image(overlay)
+            path = self.pm.render_cache.put(job, image, overlay)
+            self.pm.log("Pre-rendered job " + job.uuid)
+            return path
+        except Exception:
+            self.pm.app.logger.exception("Error pre-rendering job " + job.uuid)
+            return None
+
+    def stop(self):
+        self.stopped = True
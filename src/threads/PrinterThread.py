@@ -1,14 +1,15 @@
 CUPS_ENABLED = False
 
+import os
 import threading
 import time
 from typing import TYPE_CHECKING
 
 if CUPS_ENABLED: import cups
 
-import tempfile
-import os
+from PIL import Image
 
+from src.Broadcaster import Broadcaster
 from src.PrintJob import PrintJob
 
 if TYPE_CHECKING:
@@ -54,6 +55,7 @@ class PrinterThread(threading.Thread):
 
     def on_print(self):
         self.counter -= 1
+        self.pm.broadcaster.publish(Broadcaster.PROGRESS)
         self.pm.log("Currently printing Image: " + str(self.pm.current_print_job))
         # Check if printer has finished printing
         printing_finished = self.counter <= 0
@@ -97,17 +99,28 @@ class PrinterThread(threading.Thread):
 
 
     def on_finish_print_image(self, element: PrintJob):
-        self.pm.current_print_job = None
+        self.pm.set_current_print_job(None)
         self.pm.log("Finished printing image")
 
+        self.pm.render_cache.discard(element)
         element.delete()
 
+    def skip_print_job(self, element: PrintJob):
+        """Drops the current job without printing, e.g. because its image is missing or cannot be decoded."""
+        self.pm.set_current_print_job(None)
+        self.pm.log("Skipping job " + element.uuid)
+
+        self.pm.render_cache.discard(element)
+        if os.path.exists(element.image_file): element.delete()
+
     def start_print_job(self, element: PrintJob):
-        self.pm.current_print_job = element
         self.pm.log("Start Print Job")
 
-        self.print_pil_image(element)
+        if not self.print_pil_image(element):
+            self.skip_print_job(element)
+            return
         self.counter = self.PRINT_COUNTDOWN
+        self.pm.broadcaster.publish(Broadcaster.PROGRESS)
 
 
     def pick_printer(self, conn):
@@ -115,35 +128,43 @@ class PrinterThread(threading.Thread):
         print("Other" + str(conn.getPrinters()))
         return conn.getDefault() or sorted(conn.getPrinters().keys())[0]
 
-    def print_pil_image(self, print_job: PrintJob):
+    def print_pil_image(self, print_job: PrintJob) -> bool:
+        """:return: False if the job could not be rendered"""
         options = {
             "fit-to-page": "True",
             "media": "A4",
         }
 
-        img = print_job.open_and_preprocess_image()
-        img.show()
+        if not os.path.exists(print_job.image_file):
+            self.pm.log("Image of job " + print_job.uuid + " is missing, skipping")
+            return False
 
-        if not CUPS_ENABLED: return
+        # Normalfall: bereits vom PrerenderThread gerendert, sonst jetzt rendern
+        rendered = self.pm.render_cache.get(print_job)
+        if rendered is None:
+            self.pm.log("Job " + print_job.uuid + " not pre-rendered, rendering now")
+            try:
+                overlay = self.pm.overlay_for(print_job)
+                img = print_job.open_and_preprocess_image(overlay)
+                rendered = self.pm.render_cache.put(print_job, img, overlay)
+            except (OSError, ValueError):
+                # z.B. abgeschnittene oder inzwischen gelöschte Datei: den Job verwerfen, der Thread muss weiterlaufen
+                self.pm.app.logger.exception("Error rendering job " + print_job.uuid)
+                return False
+            if rendered is None:
+                return False   # Bild zwischen Rendern und Ablegen gelöscht
+
+        if not CUPS_ENABLED:
+            Image.open(rendered).show()
+            return True
         printer = self.pick_printer(self.conn)
 
-        # als temporäre Datei speichern (PNG oder JPEG)
-        tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        tmp_path = tmp.name
         try:
-            img.save(tmp, format="PNG")
-            tmp.close()  # wichtig: schließen, damit CUPS die Datei lesen kann
-
-            job_id = self.conn.printFile(printer, tmp_path, print_job.uuid, options)
+            job_id = self.conn.printFile(printer, rendered, print_job.uuid, options)
             self.pm.log(f"Job {job_id} an '{printer}' gesendet.")
         except Exception as e:
             print(e)
-        finally:
-            # Temp-Datei aufräumen
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+        return True
 
 
     def stop(self):
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from owncloud import FileInfo
+
+from src.storage.RemoteStorage import RemoteStorage
+
+if TYPE_CHECKING:
+    from src.PrintManager import PrintManager
+
+
+class RemoteCleanupThread(threading.Thread):
+    """
+    Deletes ingested files from the remote storage in the background.
+    The fetcher schedules paths once their job is stored locally; deletes are sent in
+    batches, failed ones are retried with backoff. The pending list is written to disk,
+    so files already ingested before a restart are not ingested a second time.
+    """
+    PENDING_FILE = "downloads/pending_deletes.json"
+    BATCH_SIZE = 32
+    # Seconds to collect further deletes before a batch is sent
+    BATCH_DELAY = 1.0
+    RETRY_DELAY = 5.0
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, state: "PrintManager", storage: RemoteStorage):
+        super().__init__(name="RemoteCleanupThread", daemon=True)
+        self.state = state
+        self.storage = storage
+        self.stopped = False
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        # Batches in a row that failed as a whole (e.g. network down)
+        self.failures = 0
+
+        # path → (attempts, not before)
+        self.pending: dict[str, tuple[int, float]] = {}
+        os.makedirs(os.path.dirname(self.PENDING_FILE), exist_ok=True)
+        self._load_pending()
+
+    def schedule(self, paths: list[str]):
+        with self.lock:
+            for path in paths:
+                self.pending.setdefault(path, (0, 0.0))
+            self._save_pending()
+        self.wakeup.set()
+
+    def is_pending(self, path: str) -> bool:
+        with self.lock:
+            return path in self.pending
+
+    def run(self):
+        for folder in (self.state.config.nc_images_folder, self.state.config.nc_metadata_folder):
+            try:
+                self._clear_files_from_last_day(folder)
+            except Exception:
+                self.state.app.logger.exception("Error clearing files from last day in " + folder)
+
+        while not self.stopped:
+            self.wakeup.wait(self.RETRY_DELAY)
+            if self.stopped: break
+            self.wakeup.clear()
+            time.sleep(self.BATCH_DELAY)
+
+            try:
+                while (batch := self._next_batch()) and not self.stopped:
+                    self._delete_batch(batch)
+            except Exception:
+                # Never end the thread, pending files would be skipped by the fetcher forever
+                self.state.app.logger.exception("Error deleting remote files")
+
+    def _next_batch(self) -> list[str]:
+        now = time.monotonic()
+        with self.lock:
+            return [path for path, (_, not_before) in self.pending.items() if not_before <= now][:self.BATCH_SIZE]
+
+    def _delete_batch(self, batch: list[str]):
+        try:
+            results = self.storage.delete_many(batch)
+        except Exception:
+            self.state.app.logger.exception(f"Error deleting {len(batch)} remote files")
+            self._postpone(batch)
+            return
+        self.failures = 0
+
+        now = time.monotonic()
+        with self.lock:
+            for path, deleted in zip(batch, results):
+                attempts = self.pending[path][0] + 1
+                if deleted or attempts >= self.MAX_ATTEMPTS:
+                    if not deleted: self.state.log("Giving up deleting file: " + path)
+                    del self.pending[path]
+                else:
+                    self.pending[path] = (attempts, now + self.RETRY_DELAY * 2 ** (attempts - 1))
+            self._save_pending()
+
+    def _postpone(self, batch: list[str]):
+        """Keeps the whole batch pending without using up attempts, backing off while failures repeat."""
+        self.failures += 1
+        not_before = time.monotonic() + self.RETRY_DELAY * 2 ** min(self.failures - 1, 6)
+        with self.lock:
+            for path in batch:
+                if path in self.pending: self.pending[path] = (self.pending[path][0], not_before)
+
+    def _clear_files_from_last_day(self, folder: str):
+        self.state.log("Clearing files from last day")
+        old_files = [file.path for file in self.storage.list_folder(folder) if self.is_expired(file)]
+        if old_files:
+            self.state.log(f"Scheduled {len(old_files)} files from last day for deletion")
+            self.schedule(old_files)
+
+    def _load_pending(self):
+        try:
+            with open(self.PENDING_FILE) as f:
+                self.pending = {path: (0, 0.0) for path in json.load(f)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            self.state.app.logger.exception("Error loading pending deletes")
+
+    def _save_pending(self):
+        tmp_path = self.PENDING_FILE + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(self.pending), f)
+        os.replace(tmp_path, self.PENDING_FILE)
+
+    def stop(self):
+        self.stopped = True
+        self.wakeup.set()
+
+    @classmethod
+    def is_expired(cls, file: FileInfo) -> bool:
+        """Files from last day are deleted without being ingested."""
+        try:
+            return (datetime.now() - cls._datetime_to_utc(file.get_last_modified())).days >= 1
+        except (KeyError, ValueError):
+            return False
+
+    @staticmethod
+    def _datetime_to_utc(utc_datetime):
+        now_timestamp = time.time()
+        offset = datetime.fromtimestamp(now_timestamp) - datetime.utcfromtimestamp(now_timestamp)
+        return utc_datetime + offset
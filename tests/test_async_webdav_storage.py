@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.storage.AsyncWebDavStorage import _Connection
+
+
+class FakeWriter:
+    """Fails the first drain like a reset connection, without closing by itself."""
+
+    def __init__(self, reader: asyncio.StreamReader, fail: bool):
+        self.reader = reader
+        self.fail = fail
+        self.closed = False
+
+    def write(self, data: bytes):
+        pass
+
+    async def drain(self):
+        if self.fail:
+            self.fail = False
+            raise ConnectionResetError("Connection reset by peer")
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.reader.feed_eof()
+
+
+def test_failed_write_does_not_take_a_later_response():
+    async def scenario():
+        connection = _Connection("127.0.0.1", 80, False, depth=4)
+        opened = []
+
+        async def open_connection():
+            connection.reader = asyncio.StreamReader()
+            connection.writer = FakeWriter(connection.reader, fail=not opened)
+            opened.append(connection.reader)
+        connection._open = open_connection
+
+        with pytest.raises(ConnectionResetError):
+            await connection.request("GET", "/first", {})
+        assert not connection.pending
+
+        second = asyncio.create_task(connection.request("GET", "/second", {}))
+        await asyncio.sleep(0)
+        connection.reader.feed_data(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        response = await asyncio.wait_for(second, 2)
+        assert (response.status, response.body) == (200, b"ok")
+
+    asyncio.run(scenario())
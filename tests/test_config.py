@@ -0,0 +1,31 @@
+from src.Config import Config
+
+BASE = """
+nc_username: user
+nc_password: password
+nc_images_folder: /screenshots
+nc_metadata_folder: /metadata
+nc_check_time: 8
+"""
+
+
+def load(tmp_path, extra: str = "") -> Config:
+    path = tmp_path / "config.yml"
+    path.write_text(BASE + extra)
+    return Config(str(path))
+
+
+def test_adaptive_polling_is_never_slower_than_nc_check_time_by_default(tmp_path):
+    config = load(tmp_path)
+    assert config.nc_check_time_min == 2
+    assert config.nc_check_time_max == 8
+
+
+def test_poll_bounds_can_be_configured(tmp_path):
+    config = load(tmp_path, "nc_check_time_min: 1\nnc_check_time_max: 30\n")
+    assert (config.nc_check_time_min, config.nc_check_time_max) == (1, 30)
+
+
+def test_poll_max_is_at_least_min(tmp_path):
+    config = load(tmp_path, "nc_check_time_min: 20\n")
+    assert config.nc_check_time_max == 20
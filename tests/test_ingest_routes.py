@@ -0,0 +1,121 @@
+import io
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+from flask import Request
+from PIL import Image
+
+from src.Ingestor import Ingestor
+from website import create_app
+
+
+def png(color=(10, 200, 30), size=(64, 48)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class StubPrintManager:
+    def __init__(self, max_mb: float = 1):
+        self.config = SimpleNamespace(
+            ingest_token=None, ingest_max_mb=max_mb,
+            ingest_dedupe=True, ingest_dedupe_window=600, ingest_dedupe_perceptual=False, ingest_dedupe_distance=4,
+        )
+        self.app = SimpleNamespace(logger=logging.getLogger("ingest-test"))
+        self.thumbnails = SimpleNamespace(generate=lambda path: None)
+        self.ingestor = Ingestor(self)
+        self.jobs = []
+
+    def add_new_job(self, job):
+        self.jobs.append(job)
+
+    def log(self, message: str):
+        self.app.logger.info(message)
+
+
+@pytest.fixture
+def pm(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def no_temp_copy(*args, **kwargs):
+        raise AssertionError("upload was spooled to a temporary file")
+    monkeypatch.setattr(Request, "_get_file_stream", no_temp_copy)
+    return StubPrintManager()
+
+
+@pytest.fixture
+def client(pm):
+    app = create_app()
+    app.extensions["printer_manager"] = pm
+    return app.test_client()
+
+
+def stored_files() -> list[str]:
+    return sorted(os.listdir(Ingestor.IMAGES_FOLDER))
+
+
+def test_multipart_upload_is_stored_once(client, pm):
+    data = png()
+    response = client.post("/api/ingest", data={
+        "image": (io.BytesIO(data), "shot.png"),
+        "metadata": '{"pcName": "PC-1"}',
+        "plotId": "42",
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 201
+    job = pm.jobs[0]
+    assert job.uuid == response.json["uuid"]
+    assert (job.pc_name, job.plot) == ("PC-1", "42")
+    assert stored_files() == [job.uuid + ".png"]
+    with open(job.image_file, "rb") as f:
+        assert f.read() == data
+
+
+def test_metadata_as_file_part(client, pm):
+    response = client.post("/api/ingest", data={
+        "image": (io.BytesIO(png()), "shot.png"),
+        "metadata": (io.BytesIO(b'{"plotId": "7"}'), "meta.json"),
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 201
+    assert pm.jobs[0].plot == "7"
+    assert stored_files() == [pm.jobs[0].uuid + ".png"]
+
+
+def test_duplicate_upload_leaves_no_files(client, pm):
+    first = client.post("/api/ingest", data={"image": (io.BytesIO(png()), "a.png")}, content_type="multipart/form-data")
+    second = client.post("/api/ingest", data={"image": (io.BytesIO(png()), "b.png")}, content_type="multipart/form-data")
+
+    assert second.status_code == 200
+    assert second.json == {"ok": True, "uuid": first.json["uuid"], "duplicate": True}
+    assert len(stored_files()) == 1
+
+
+@pytest.mark.parametrize("body, status", [
+    (b"not an image", 400),
+    (png(size=(640, 480))[:-200], 400),   # truncated, the header alone is fine
+    (os.urandom(2 * 1024 * 1024), 413),
+], ids=["not-an-image", "truncated", "too-large"])
+def test_rejected_uploads_leave_no_files(client, body, status):
+    response = client.post("/api/ingest", data={"image": (io.BytesIO(body), "shot.png")}, content_type="multipart/form-data")
+
+    assert response.status_code == status
+    assert stored_files() == []
+
+
+def test_raw_body_upload(client, pm):
+    response = client.post("/api/ingest?plotId=3", data=png(), content_type="image/png")
+
+    assert response.status_code == 201
+    assert pm.jobs[0].plot == "3"
+    assert stored_files() == [pm.jobs[0].uuid + ".png"]
+
+
+def test_raw_body_upload_too_large(client):
+    response = client.post("/api/ingest", data=os.urandom(2 * 1024 * 1024), content_type="image/png")
+
+    assert response.status_code == 413
+    assert response.json == {"ok": False, "error": "Image too large"}
+    assert stored_files() == []
@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+from owncloud import FileInfo
+
+from src.storage.RemoteStorage import RemoteStorageError
+from src.threads.NextcloudFetcherThread import NextcloudFetcherThread
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(NextcloudFetcherThread, "SIDECAR_GRACE", 0.3)
+    config = SimpleNamespace(
+        nc_username="user", nc_password="password", nc_url="http://127.0.0.1:9", nc_backend="owncloud",
+        nc_images_folder="/screenshots", nc_metadata_folder="/metadata",
+        nc_check_time_min=1.0, nc_check_time_max=60.0,
+        nc_download_workers=1, nc_connections=1, nc_pipeline_depth=1,
+        ingest_decode_workers=1, ingest_queue_size=4,
+    )
+    logger = logging.getLogger("fetcher-test")
+    state = SimpleNamespace(config=config, app=SimpleNamespace(logger=logger), log=logger.info)
+    return NextcloudFetcherThread(state)
+
+
+def image(name: str, uploaded: float) -> FileInfo:
+    return FileInfo("/screenshots/" + name, attributes={"{DAV:}getlastmodified": formatdate(uploaded, usegmt=True)})
+
+
+def test_old_image_without_sidecar_is_not_held_back(fetcher):
+    assert not fetcher._wait_for_sidecar(image("old.png", time.time() - 60))
+    assert not fetcher.waiting_for_sidecar
+
+
+def test_fresh_image_waits_at_most_the_grace_window(fetcher):
+    fresh = image("fresh.png", time.time() + 30)   # server clock ahead: bounded by local time
+    assert fetcher._wait_for_sidecar(fresh)
+    assert fetcher._wait_for_sidecar(fresh)
+
+    time.sleep(0.35)
+    assert not fetcher._wait_for_sidecar(fresh)
+
+
+class FailingDownloads:
+    """Unchanged folder ETag, every download fails once released."""
+
+    def __init__(self, files: list[FileInfo]):
+        self.files = files
+        self.listings = 0
+        self.downloads = 0
+        self.release = threading.Event()
+
+    def folder_etag(self, folder: str) -> str:
+        return '"unchanged"'
+
+    def list_folder(self, folder: str) -> list[FileInfo]:
+        if folder != "/screenshots": return []
+        self.listings += 1
+        return self.files
+
+    def get_file_contents(self, path: str) -> bytes:
+        self.downloads += 1
+        self.release.wait(5)
+        raise RemoteStorageError("Service unavailable", 503)
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_failed_download_is_listed_again_under_the_same_etag(fetcher):
+    storage = FailingDownloads([image("shot.png", time.time() - 60)])
+    fetcher.storage = storage
+    fetcher.pipeline.start()
+    try:
+        fetcher.poll()
+        wait_until(lambda: storage.downloads == 1)
+        fetcher.poll()   # still in flight: the folder is not resolved yet
+        assert fetcher.images_etag is None
+
+        storage.release.set()
+        wait_until(lambda: not fetcher.in_flight)
+        fetcher.poll()
+        wait_until(lambda: storage.downloads == 2)
+    finally:
+        storage.release.set()
+        fetcher.pipeline.stop()
+
+    assert storage.listings == 3
@@ -0,0 +1,44 @@
+import pytest
+
+from benchmarks.webdav_standin import WebDavStandIn
+from src.storage.OwncloudStorage import OwncloudStorage
+from src.storage.RemoteStorage import RemoteStorageError
+
+
+@pytest.fixture
+def server():
+    server = WebDavStandIn().start()
+    server.folders.add("/screenshots/")
+    server.put("/screenshots/a.png", b"png")
+    yield server
+    server.stop()
+
+
+def test_connection_failures_raise_remote_storage_error(server):
+    storage = OwncloudStorage(server.url)
+    storage.login("user", "password")
+    assert storage.folder_etag("/screenshots") is not None
+
+    server.stop()
+    storage.oc._session.close()   # drop the kept-alive connection, the server is gone
+
+    with pytest.raises(RemoteStorageError) as error:
+        storage.folder_etag("/screenshots")
+    assert error.value.status_code is None
+    with pytest.raises(RemoteStorageError):
+        storage.list_folder("/screenshots")
+    assert storage.delete_many(["/screenshots/a.png"]) == [False]
+
+
+def test_unreachable_server_on_login():
+    storage = OwncloudStorage("http://127.0.0.1:9")
+    with pytest.raises(RemoteStorageError):
+        storage.login("user", "password")
+
+
+def test_http_errors_keep_their_meaning(server):
+    storage = OwncloudStorage(server.url)
+    storage.login("user", "password")
+    assert storage.folder_etag("/missing") is None
+    assert storage.exists("/missing") is False
+    assert storage.delete_many(["/screenshots/a.png", "/screenshots/gone.png"]) == [True, True]
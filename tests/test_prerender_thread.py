@@ -0,0 +1,45 @@
+import logging
+import os
+from types import SimpleNamespace
+
+from src.Broadcaster import Broadcaster
+from src.JobStore import JobStore
+from src.PrintJob import PrintJob
+from src.image.OverlayRegistry import OverlayRegistry
+from src.threads.PrerenderThread import PrerenderThread
+
+
+def prerender_thread(prerender_unlisted: bool = False) -> PrerenderThread:
+    pm = SimpleNamespace(
+        config=SimpleNamespace(prerender_unlisted=prerender_unlisted),
+        app=SimpleNamespace(logger=logging.getLogger("prerender-test")),
+        overlays=OverlayRegistry(), jobs=JobStore(Broadcaster()), DEFAULT_OVERLAY="default.json",
+    )
+    return PrerenderThread(pm)
+
+
+def submitted(thread: PrerenderThread) -> list[str]:
+    uuids = []
+    while not thread.jobs.empty():
+        uuids.append(thread.jobs.get_nowait().uuid)
+    return uuids
+
+
+def test_jobs_are_rendered_again_when_their_template_changes(tmp_path):
+    template, other = tmp_path / "overlay.json", tmp_path / "other.json"
+    template.write_text('{"nodes": []}')
+    other.write_text('{"nodes": []}')
+
+    thread = prerender_thread()
+    for uuid, overlay, name in (("a", template, JobStore.QUEUE), ("b", other, JobStore.QUEUE), ("c", template, JobStore.UNLISTED)):
+        job = PrintJob(uuid, "missing.png", {})
+        job.overlay_path = str(overlay)
+        thread.pm.jobs.append(name, job)
+
+    thread.check_overlays()
+    assert submitted(thread) == []
+
+    template.write_text('{"nodes": [], "image": null}')
+    os.utime(template, ns=(0, 0))
+    thread.check_overlays()
+    assert submitted(thread) == ["a"]
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.PrintJob import PrintJob
+from website import create_app
+
+
+@pytest.fixture
+def client(tmp_path):
+    job = PrintJob("job", str(tmp_path / "deleted.png"), {})
+    pm = SimpleNamespace(find_job=lambda uuid: job if uuid == job.uuid else None, overlay_for=lambda job: None)
+    app = create_app()
+    app.extensions["printer_manager"] = pm
+    return app.test_client()
+
+
+def test_preview_of_a_deleted_image_is_not_found(client):
+    response = client.get("/api/preview/job")
+
+    assert response.status_code == 404
+    assert response.json == {"ok": False, "error": "Image not found"}
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from src.PrintJob import PrintJob
+
+
+def make_job() -> PrintJob:
+    return PrintJob("job-1", "downloads/images/job-1.png", {"pcName": "PC-3", "plotId": "12"})
+
+
+def test_to_json_is_memoised():
+    job = make_job()
+    assert job.to_json() is job.to_json()
+
+
+@pytest.mark.parametrize("change, field, expected", [
+    (lambda job: job.update_metadata(plotId="13"), "plot", "13"),
+    (lambda job: job.update_metadata(pcName="PC-4"), "pc_name", "PC-4"),
+    (lambda job: setattr(job, "metadata", {"plotId": "14"}), "plot", "14"),
+    (lambda job: setattr(job, "overlay_path", "templates/other.json"), "overlay", "templates/other.json"),
+    (lambda job: setattr(job, "image_file", "downloads/images/other.png"), "image_url", "/api/images-ext/downloads/images/other.png"),
+])
+def test_changes_reach_to_json(change, field, expected):
+    job = make_job()
+    job.to_json()
+
+    change(job)
+
+    assert json.loads(job.to_json())[field] == expected
+
+
+def test_derived_and_identity_fields_are_read_only():
+    job = make_job()
+    for field in ("pc_name", "plot", "uuid"):
+        with pytest.raises(AttributeError):
+            setattr(job, field, "x")
+    with pytest.raises(TypeError):
+        job.metadata["plotId"] = "x"
+    assert json.loads(job.to_json())["plot"] == "12"
@@ -0,0 +1,56 @@
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.PrintJob import PrintJob
+from src.image.RenderCache import RenderCache
+from src.threads.PrinterThread import PrinterThread
+
+
+class StubPrintManager:
+    def __init__(self, cache_dir: str):
+        self.config = SimpleNamespace()
+        self.app = SimpleNamespace(logger=logging.getLogger("printer-test"))
+        self.render_cache = RenderCache(cache_dir)
+        self.current_print_job = None
+        self.published = []
+        self.broadcaster = SimpleNamespace(publish=self.published.append)
+
+    def set_current_print_job(self, job):
+        self.current_print_job = job
+
+    def overlay_for(self, job):
+        return None
+
+    def log(self, message: str):
+        self.app.logger.info(message)
+
+
+@pytest.fixture
+def pm(tmp_path):
+    return StubPrintManager(str(tmp_path / "rendered"))
+
+
+def test_truncated_image_is_skipped(pm, tmp_path):
+    path = tmp_path / "truncated.png"
+    Image.new("RGB", (640, 480), (200, 10, 10)).save(path)
+    path.write_bytes(path.read_bytes()[:-200])
+
+    job = PrintJob("truncated", str(path), {})
+    pm.set_current_print_job(job)
+    PrinterThread(pm).start_print_job(job)
+
+    assert pm.current_print_job is None
+    assert not path.exists()
+    assert os.listdir(tmp_path / "rendered") == []
+
+
+def test_missing_image_is_skipped(pm, tmp_path):
+    job = PrintJob("missing", str(tmp_path / "deleted.png"), {})
+    pm.set_current_print_job(job)
+    PrinterThread(pm).start_print_job(job)
+
+    assert pm.current_print_job is None
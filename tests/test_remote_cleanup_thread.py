@@ -0,0 +1,76 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.threads.RemoteCleanupThread import RemoteCleanupThread
+
+
+class FlakyStorage:
+    """delete_many raises for the first `failures` calls, then deletes everything."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls: list[list[str]] = []
+
+    def list_folder(self, folder):
+        return []
+
+    def delete_many(self, paths):
+        self.calls.append(list(paths))
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("network down")
+        return [True] * len(paths)
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(RemoteCleanupThread, "BATCH_DELAY", 0.0)
+    monkeypatch.setattr(RemoteCleanupThread, "RETRY_DELAY", 0.05)
+    logger = logging.getLogger("cleanup-test")
+    return SimpleNamespace(
+        config=SimpleNamespace(nc_images_folder="/screenshots", nc_metadata_folder="/metadata"),
+        app=SimpleNamespace(logger=logger),
+        log=logger.info,
+    )
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_failing_delete_many_keeps_files_pending_and_thread_alive(state):
+    storage = FlakyStorage(failures=2)
+    cleanup = RemoteCleanupThread(state, storage)
+    cleanup.start()
+    try:
+        cleanup.schedule(["/screenshots/a.png", "/screenshots/b.png"])
+
+        assert wait_until(lambda: len(storage.calls) >= 1)
+        assert cleanup.is_alive()
+        assert cleanup.is_pending("/screenshots/a.png")
+
+        assert wait_until(lambda: not cleanup.is_pending("/screenshots/a.png"))
+        assert not cleanup.is_pending("/screenshots/b.png")
+        assert len(storage.calls) == 3
+        assert cleanup.is_alive()
+    finally:
+        cleanup.stop()
+        cleanup.join(2)
+
+
+def test_failed_batches_do_not_use_up_attempts(state):
+    storage = FlakyStorage(failures=RemoteCleanupThread.MAX_ATTEMPTS + 1)
+    cleanup = RemoteCleanupThread(state, storage)
+    cleanup.schedule(["/screenshots/a.png"])
+
+    for _ in range(RemoteCleanupThread.MAX_ATTEMPTS + 1):
+        cleanup._delete_batch(["/screenshots/a.png"])
+
+    assert cleanup.is_pending("/screenshots/a.png")
+    assert cleanup.pending["/screenshots/a.png"][0] == 0
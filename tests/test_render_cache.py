@@ -0,0 +1,48 @@
+import os
+from types import SimpleNamespace
+
+from PIL import Image
+
+from src.PrintJob import PrintJob
+from src.image.RenderCache import RenderCache
+
+
+def overlay_version(path: str) -> str:
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def test_editing_the_template_invalidates_renders(tmp_path):
+    image_file = tmp_path / "job.png"
+    Image.new("RGB", (40, 30)).save(image_file)
+    template = tmp_path / "overlay.json"
+    template.write_text('{"nodes": []}')
+
+    cache = RenderCache(str(tmp_path / "rendered"))
+    job = PrintJob("job", str(image_file), {"plotId": "1"})
+    job.overlay_path = str(template)
+
+    overlay = SimpleNamespace(version=overlay_version(str(template)))
+    path = cache.put(job, Image.new("RGB", (40, 30)), overlay)
+    assert cache.get(job) == path
+
+    template.write_text('{"nodes": [], "image": null}')
+    assert cache.get(job) is None
+
+
+def test_render_of_an_outdated_template_is_not_a_hit(tmp_path):
+    image_file = tmp_path / "job.png"
+    Image.new("RGB", (40, 30)).save(image_file)
+    template = tmp_path / "overlay.json"
+    template.write_text('{"nodes": []}')
+
+    cache = RenderCache(str(tmp_path / "rendered"))
+    job = PrintJob("job", str(image_file), {})
+    job.overlay_path = str(template)
+
+    # Template changed while the old version was being rendered
+    outdated = SimpleNamespace(version=overlay_version(str(template)))
+    template.write_text('{"nodes": [], "image": null}')
+    cache.put(job, Image.new("RGB", (40, 30)), outdated)
+
+    assert cache.get(job) is None
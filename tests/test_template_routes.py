@@ -0,0 +1,36 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from src.image.OverlayRegistry import OverlayRegistry
+from website import create_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app()
+    app.static_folder = str(tmp_path)
+    (tmp_path / "overlay-templates").mkdir()
+    app.extensions["printer_manager"] = SimpleNamespace(overlays=OverlayRegistry())
+    return app
+
+
+def test_upload_and_delete_invalidate_the_template(app, tmp_path):
+    overlays = app.extensions["printer_manager"].overlays
+    changed = []
+    overlays.add_listener(changed.append)
+    path = tmp_path / "overlay-templates" / "overlay.json"
+    path.write_text('{"nodes": []}')
+    first = overlays.get(str(path))
+
+    client = app.test_client()
+    response = client.post("/api/template/upload", data={
+        "template": (io.BytesIO(b'{"nodes": []}'), "overlay.json"),
+    }, content_type="multipart/form-data")
+    assert response.status_code == 201
+    assert changed == [str(path)]
+    assert overlays.get(str(path)) is not first
+
+    assert client.delete("/api/template/delete/overlay.json").status_code == 204
+    assert changed == [str(path)] * 2
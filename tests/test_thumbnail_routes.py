@@ -0,0 +1,40 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.image.ThumbnailCache import ThumbnailCache
+from website import create_app
+from website.routes import thumbnail_routes
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(thumbnail_routes, "EXTERNAL_IMAGE_DIR", tmp_path)
+    app = create_app()
+    app.extensions["printer_manager"] = SimpleNamespace(thumbnails=ThumbnailCache("downloads/thumbnails"))
+    return app.test_client()
+
+
+def test_thumbnail_is_served(client, tmp_path):
+    Image.new("RGB", (800, 600), (200, 30, 30)).save(tmp_path / "shot.png")
+
+    response = client.get("/api/thumbnails/shot.png")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    with Image.open(io.BytesIO(response.data)) as thumb:
+        assert max(thumb.size) <= 320
+
+    assert client.get("/api/thumbnails/shot.png", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_missing_image_is_404(client):
+    assert client.get("/api/thumbnails/missing.png").status_code == 404
+
+
+def test_non_image_is_404(client, tmp_path):
+    (tmp_path / "notes.png").write_text("not an image")
+    assert client.get("/api/thumbnails/notes.png").status_code == 404
@@ -1,6 +1,6 @@
 from flask import Flask
 
-from .routes import template_routes, index_routes, current_job_routes, images_routes, queue_routes, controls_routes, editor
+from .routes import template_routes, index_routes, current_job_routes, images_routes, queue_routes, controls_routes, editor, preview_routes, thumbnail_routes, ingest_routes, stream_routes
 
 
 def create_app():
@@ -17,5 +17,9 @@ def create_app():
     app.register_blueprint(queue_routes.bp)
     app.register_blueprint(editor.bp)
     app.register_blueprint(controls_routes.bp)
+    app.register_blueprint(preview_routes.bp)
+    app.register_blueprint(thumbnail_routes.bp)
+    app.register_blueprint(ingest_routes.bp)
+    app.register_blueprint(stream_routes.bp)
 
     return app
\ No newline at end of file
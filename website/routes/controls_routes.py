@@ -40,7 +40,7 @@ def pause():
     if pm is None:
         return jsonify({"ok": False, "error": "Printer thread missing"}), 500
 
-    pm.paused = True
+    pm.set_paused(True)
 
     return jsonify({"ok": True, "paused": True})
 
@@ -50,6 +50,6 @@ def resume():
     if pm is None:
         return jsonify({"ok": False, "error": "Printer thread missing"}), 500
 
-    pm.paused = False
+    pm.set_paused(False)
 
     return jsonify({"ok": True, "paused": False})
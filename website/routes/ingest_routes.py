@@ -0,0 +1,119 @@
+import hmac
+import json
+from typing import TYPE_CHECKING
+
+from flask import Blueprint, current_app, request, jsonify
+from PIL import UnidentifiedImageError
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import parse_form_data
+
+from src.Ingestor import DuplicateImage, IngestTooLarge, PartFile
+
+if TYPE_CHECKING: from src.PrintManager import PrintManager
+
+bp = Blueprint("ingest", __name__, url_prefix="/api/ingest")
+
+METADATA_FIELDS = ("pcName", "plotId", "player")
+# image + metadata file + form fields, with some headroom
+MAX_FORM_PARTS = 16
+
+def get_pm() -> "PrintManager":
+    return getattr(current_app, "extensions", {}).get("printer_manager")
+
+@bp.route("", methods=["POST"])
+def ingest():
+    """
+    Direct upload of a screenshot, bypassing the Nextcloud.
+
+    Either multipart/form-data with the file part "image" and optional "metadata"
+    (JSON field or file) plus the form fields pcName/plotId/player, or the raw image
+    as request body (image/* or application/octet-stream) with the metadata fields as
+    query parameters. An Idempotency-Key header makes retries return the earlier job.
+    File parts are parsed straight into the images folder (no temporary copy).
+    """
+    pm = get_pm()
+    if pm is None:
+        return jsonify({"ok": False, "error": "PrintManager missing"}), 500
+
+    token = pm.config.ingest_token
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), "Bearer " + token):
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    max_bytes = int(pm.config.ingest_max_mb * 1024 * 1024)
+    request.max_content_length = max_bytes
+
+    key = request.headers.get("Idempotency-Key")
+    if key:
+        claimed, job_uuid = pm.ingestor.claim_idempotency_key(key)
+        if not claimed:
+            if job_uuid is None:
+                return jsonify({"ok": False, "error": "Upload with this key is in progress"}), 409
+            return jsonify({"ok": True, "uuid": job_uuid, "duplicate": True}), 200
+
+    job_uuid = None
+    parts: list[PartFile] = []
+    try:
+        if request.mimetype == "multipart/form-data":
+            def stream_factory(*args, **kwargs) -> PartFile:
+                parts.append(pm.ingestor.new_part())
+                return parts[-1]
+
+            try:
+                _, form, files = parse_form_data(request.environ, stream_factory=stream_factory,
+                                                 max_content_length=max_bytes, max_form_parts=MAX_FORM_PARTS)
+            except RequestEntityTooLarge:
+                return jsonify({"ok": False, "error": "Image too large"}), 413
+            image = files.get("image")
+            if image is None:
+                return jsonify({"ok": False, "error": "Missing 'image'"}), 400
+            upload, metadata = image.stream, _form_metadata(form, files)
+        elif request.mimetype.startswith("image/") or request.mimetype == "application/octet-stream":
+            upload, metadata = None, _query_metadata()
+        else:
+            return jsonify({"ok": False, "error": "Unsupported content type"}), 415
+
+        if metadata is None:
+            return jsonify({"ok": False, "error": "Invalid 'metadata'"}), 400
+
+        try:
+            if upload is not None:
+                job = pm.ingestor.create_job_from_part(upload, metadata)
+            else:
+                job = pm.ingestor.create_job(request.stream, metadata, max_bytes)
+        except UnidentifiedImageError:
+            return jsonify({"ok": False, "error": "Not a valid image"}), 400
+        except (IngestTooLarge, RequestEntityTooLarge):
+            # RequestEntityTooLarge: raw body with a Content-Length above the limit
+            return jsonify({"ok": False, "error": "Image too large"}), 413
+        except DuplicateImage as e:
+            job_uuid = e.job_uuid
+            return jsonify({"ok": True, "uuid": job_uuid, "duplicate": True}), 200
+
+        pm.add_new_job(job)
+        job_uuid = job.uuid
+        pm.log("Received job " + job.uuid + " via upload")
+        return jsonify({"ok": True, "uuid": job.uuid}), 201
+    finally:
+        for part in parts: part.discard()
+        if key: pm.ingestor.complete_idempotency_key(key, job_uuid)
+
+def _form_metadata(form: MultiDict, files: MultiDict) -> dict | None:
+    raw = form.get("metadata")
+    if raw is None and "metadata" in files:
+        raw = files["metadata"].read()
+
+    metadata = {}
+    if raw:
+        try:
+            metadata = json.loads(raw)
+        except ValueError:
+            return None
+        if not isinstance(metadata, dict): return None
+
+    for field in METADATA_FIELDS:
+        if field in form: metadata[field] = form[field]
+    return metadata
+
+def _query_metadata() -> dict:
+    return {field: request.args[field] for field in METADATA_FIELDS if field in request.args}
@@ -0,0 +1,56 @@
+import io
+import os
+from typing import TYPE_CHECKING
+
+from flask import Blueprint, current_app, request, jsonify, send_file
+
+if TYPE_CHECKING: from src.PrintManager import PrintManager
+
+bp = Blueprint("preview", __name__, url_prefix="/api/preview")
+
+DEFAULT_SCALE = 0.25
+
+def get_pm() -> "PrintManager":
+    return getattr(current_app, "extensions", {}).get("printer_manager")
+
+@bp.route("/<uuid>")
+def preview(uuid):
+    """
+    Vorschau eines Jobs im Entwurfsmodus.
+    Query: overlay=<Template-Dateiname> (optional, sonst Job-/Standard-Overlay), scale=0.05..1
+    """
+    pm = get_pm()
+    if pm is None:
+        return jsonify({"ok": False, "error": "PrintManager missing"}), 500
+
+    job = pm.find_job(uuid)
+    if job is None:
+        return jsonify({"ok": False, "error": "Job not found"}), 404
+
+    try:
+        scale = min(1.0, max(0.05, float(request.args.get("scale", DEFAULT_SCALE))))
+    except ValueError:
+        return jsonify({"ok": False, "error": "Invalid 'scale'"}), 400
+
+    template = request.args.get("overlay")
+    if template:
+        template_path = os.path.join(current_app.static_folder, "overlay-templates", os.path.basename(template))
+        if not os.path.isfile(template_path):
+            return jsonify({"ok": False, "error": "Overlay not found"}), 404
+        overlay = pm.overlays.get(template_path)
+    else:
+        try:
+            overlay = pm.overlay_for(job)
+        except FileNotFoundError:
+            return jsonify({"ok": False, "error": "Overlay not found"}), 404
+
+    try:
+        image = job.render_preview(overlay, scale)
+    except FileNotFoundError:
+        # Bild schon gelöscht (z.B. Job gerade fertig gedruckt)
+        return jsonify({"ok": False, "error": "Image not found"}), 404
+
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=80)
+    buf.seek(0)
+    return send_file(buf, mimetype="image/jpeg", max_age=0)
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING
+
+from flask import Blueprint, current_app, Response, request, jsonify
+
+from src.Broadcaster import Broadcaster
+from .current_job_routes import current_job_payload, progress_payload, status_payload, SSE_HEADERS
+
+if TYPE_CHECKING: from src.PrintManager import PrintManager
+
+bp = Blueprint("stream", __name__, url_prefix="/api/stream")
+
+def get_pm() -> "PrintManager":
+    return getattr(current_app, "extensions", {}).get("printer_manager")
+
+@bp.route("")
+def stream():
+    """
+    Multiplexed SSE stream for the dashboard, one named event per channel.
+    Query: channels=<comma separated subset of current_job, progress, status, queue, unlisted> (default: all)
+    Resumes from the Last-Event-ID header (or lastEventId query parameter).
+    """
+    pm = get_pm()
+    if pm is None:
+        return jsonify({"ok": False, "error": "PrintManager missing"}), 500
+
+    renderers = {
+        Broadcaster.CURRENT_JOB: lambda: current_job_payload(pm),
+        Broadcaster.PROGRESS: lambda: progress_payload(pm),
+        Broadcaster.STATUS: lambda: status_payload(pm),
+        Broadcaster.QUEUE: lambda: pm.jobs.to_json(Broadcaster.QUEUE),
+        Broadcaster.UNLISTED: lambda: pm.jobs.to_json(Broadcaster.UNLISTED),
+    }
+
+    requested = request.args.get("channels")
+    if requested:
+        channels = [c.strip() for c in requested.split(",") if c.strip()]
+        unknown = [c for c in channels if c not in renderers]
+        if unknown:
+            return jsonify({"ok": False, "error": "Unknown channels: " + ", ".join(unknown)}), 400
+        renderers = {c: renderers[c] for c in channels}
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+    return Response(pm.broadcaster.multiplex(renderers, last_event_id), headers=SSE_HEADERS)
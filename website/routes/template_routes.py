@@ -1,15 +1,27 @@
 import os
+from typing import TYPE_CHECKING
 
 from flask import Blueprint, current_app, request
 
+if TYPE_CHECKING: from src.PrintManager import PrintManager
+
 bp = Blueprint("template", __name__, url_prefix="/api/template")
 
+def get_pm() -> "PrintManager":
+    return getattr(current_app, "extensions", {}).get("printer_manager")
+
+def invalidate_overlay(file_path: str):
+    # Drop the parsed template and let pending jobs using it render again
+    pm = get_pm()
+    if pm is not None: pm.overlays.invalidate(file_path)
+
 @bp.route('/delete/<template_name>', methods=['DELETE'])
 def delete_template(template_name):
     dir_path = os.path.join(current_app.static_folder, 'overlay-templates')
     file_path = os.path.join(dir_path, template_name)
     try:
         os.remove(file_path)
+        invalidate_overlay(file_path)
         current_app.logger.info('Deleted overlay template: %s', template_name)
         return '', 204
     except FileNotFoundError:
@@ -29,5 +41,6 @@ def upload_template():
         return {'error': 'No file uploaded'}, 400
     file_path = os.path.join(dir_path, file.filename)
     file.save(file_path)
+    invalidate_overlay(file_path)
     current_app.logger.info('Uploaded overlay template: %s', file.filename)
     return {'message': 'Template uploaded successfully'}, 201
\ No newline at end of file
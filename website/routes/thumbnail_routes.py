@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING
+
+from flask import Blueprint, current_app, send_file, abort
+from PIL import UnidentifiedImageError
+from werkzeug.security import safe_join
+
+from website.routes.images_routes import EXTERNAL_IMAGE_DIR
+
+if TYPE_CHECKING: from src.PrintManager import PrintManager
+
+bp = Blueprint("thumbnails", __name__, url_prefix="/api/thumbnails")
+
+def get_pm() -> "PrintManager":
+    return getattr(current_app, "extensions", {}).get("printer_manager")
+
+@bp.route("/<path:filename>")
+def thumbnail(filename):
+    pm = get_pm()
+    if pm is None:
+        abort(500)
+
+    image_path = safe_join(str(EXTERNAL_IMAGE_DIR), filename)
+    if image_path is None:
+        abort(404)
+
+    try:
+        thumb_path, etag = pm.thumbnails.get(image_path)
+    except (FileNotFoundError, IsADirectoryError, UnidentifiedImageError):
+        abort(404)
+
+    # Starkes ETag aus Quelle + Parametern; conditional=True beantwortet If-None-Match mit 304
+    return send_file(
+        thumb_path,
+        mimetype=pm.thumbnails.mimetype,
+        etag=etag,
+        conditional=True,
+        max_age=3600,
+    )
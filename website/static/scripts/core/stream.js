@@ -0,0 +1,54 @@
+/**
+ * stream.js — one multiplexed SSE connection for the whole dashboard
+ * Exposes `App.stream.on(channel, handler)` and `App.stream.onState(handler)`.
+ * The connection is opened once all scripts subscribed; on errors the browser
+ * reconnects by itself and resumes via Last-Event-ID.
+ */
+(() => {
+    "use strict";
+
+    const handlers = new Map();   // channel → [handler]
+    const stateHandlers = [];
+    let source = null;
+    let scheduled = false;
+
+    const emitState = (state) => stateHandlers.forEach((fn) => fn(state));
+
+    const connect = () => {
+        scheduled = false;
+        if (source) source.close();
+        const channels = Array.from(handlers.keys()).join(",");
+        source = new EventSource(`/api/stream?channels=${encodeURIComponent(channels)}`);
+        source.onopen = () => emitState("open");
+        source.onerror = () => emitState(source.readyState === EventSource.CLOSED ? "closed" : "reconnecting");
+        handlers.forEach((list, channel) => {
+            source.addEventListener(channel, (e) => {
+                let data;
+                try { data = JSON.parse(e.data); } catch { return; }
+                list.forEach((fn) => fn(data));
+            });
+        });
+    };
+
+    const schedule = () => {
+        if (scheduled) return;
+        scheduled = true;
+        setTimeout(connect, 0);
+    };
+
+    const on = (channel, handler) => {
+        if (!handlers.has(channel)) {
+            handlers.set(channel, []);
+            if (source) schedule();   // new channel after connect → reopen with it
+        }
+        handlers.get(channel).push(handler);
+        if (!source) schedule();
+    };
+
+    const onState = (handler) => stateHandlers.push(handler);
+
+    window.addEventListener("beforeunload", () => source && source.close());
+
+    window.App = window.App || {};
+    window.App.stream = { on, onState };
+})();
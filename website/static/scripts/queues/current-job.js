@@ -1,5 +1,5 @@
 /**
- * current-job.js — SSE client for current job + progress/eta
+ * current-job.js — current job + progress/eta (via App.stream)
  */
 (() => {
     "use strict";
@@ -66,33 +66,24 @@
 
     document.addEventListener("DOMContentLoaded", () => {
         hideJob();
-        const safeJSON = (t) => { try { return JSON.parse(t); } catch { return null; } };
+        setStatusLabel("offline");
 
-        const jobES = new EventSource("/api/current_job/stream");
-        jobES.onmessage = (e) => {
-            const raw = safeJSON(e.data);
+        App.stream.on("current_job", (raw) => {
             (!raw || raw.active === false) ? hideJob() : showJob(raw);
-        };
+        });
 
-        const progES = new EventSource("/api/current_job/progress");
-        progES.onmessage = (e) => {
-            const d = safeJSON(e.data) || {};
+        App.stream.on("progress", (d) => {
+            d = d || {};
             if (d.active === false) { setProgress(0); setEta("—"); return; }
             if (typeof d.value === "number") setProgress(d.value * 100);
             if (typeof d.eta === "string") setEta(d.eta);
-        };
-
-        setStatusLabel("offline");
-        const statusES = new EventSource("/api/current_job/status");
-        statusES.onmessage = (e) => {
-            const d = safeJSON(e.data);
-            if (d?.status) setStatusLabel(d.status);
-        };
+        });
 
-        window.addEventListener("beforeunload", () => {
-            jobES.close();
-            progES.close();
-            statusES.close();
+        // A resumed stream only resends changed channels → restore the last known status
+        let lastStatus = "offline";
+        App.stream.on("status", (d) => {
+            if (d?.status) setStatusLabel(lastStatus = d.status);
         });
+        App.stream.onState((state) => setStatusLabel(state === "open" ? lastStatus : "offline"));
     });
 })();
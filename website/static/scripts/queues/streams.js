@@ -1,24 +1,17 @@
 /**
- * streams.js — SSE lists for unlisted + queue
+ * streams.js — lists for unlisted + queue (via App.stream)
  */
 (() => {
     "use strict";
     const $ = (sel) => document.querySelector(sel);
 
     const Fallbacks = {img: "/static/images/preview.jpg", pc: "Unknown", plot: "-", overlay: "-"};
-    const clear = (node) => node && (node.textContent = "");
-    const emptyState = (root, text) => {
-        const d = document.createElement("div");
-        d.className = "empty";
-        d.textContent = text;
-        root.appendChild(d);
-    };
 
     const itemHTML = (job, type) => {
         const pc = job?.pc_name ?? Fallbacks.pc;
         const plot = job?.plot ?? Fallbacks.plot;
         const overlay = job?.overlay ?? Fallbacks.overlay;
-        const imgUrl = job?.image_url ?? Fallbacks.img;
+        const imgUrl = job?.thumbnail_url ?? job?.image_url ?? Fallbacks.img;
         const uuid = job?.uuid; // <-- wichtig
 
         const info = [
@@ -44,35 +37,102 @@
     };
 
 
-    const renderList = (list, rootId, type, emptyText) => {
-        const root = $(rootId);
-        if (!root) return;
-        clear(root);
-        if (!Array.isArray(list) || list.length === 0) return emptyState(root, emptyText);
-        const wrapper = document.createElement("div");
-        wrapper.innerHTML = list.map((j) => itemHTML(j, type)).join("");
-        root.appendChild(wrapper);
+    const createItem = (job, type) => {
+        const t = document.createElement("template");
+        t.innerHTML = itemHTML(job, type).trim();
+        return t.content.firstElementChild;
     };
 
-    const connectSSE = (url, onData) => {
-        const es = new EventSource(url);
-        es.onmessage = (e) => {
-            try {
-                onData(JSON.parse(e.data));
-            } catch {
+    /**
+     * Keeps a list element in sync with the snapshot + delta events of one channel.
+     * Items are keyed by uuid and patched in place, unchanged items keep their DOM
+     * (and loaded image). Deltas older than the last applied seq are skipped.
+     */
+    const JobList = (rootId, type, emptyText) => {
+        const root = $(rootId);
+        const items = new Map();   // uuid → {node, json}
+        let seq = -1;
+        if (!root) return null;
+
+        const empty = document.createElement("div");
+        empty.className = "empty";
+        empty.textContent = emptyText;
+
+        const updateEmpty = () => {
+            if (items.size === 0) root.appendChild(empty);
+            else empty.remove();
+        };
+
+        const nodeFor = (job) => {
+            const json = JSON.stringify(job);
+            const known = items.get(job.uuid);
+            if (known && known.json === json) return known.node;
+            const node = createItem(job, type);
+            if (known) known.node.replaceWith(node);
+            items.set(job.uuid, {node, json});
+            return node;
+        };
+
+        const place = (node, index) => {
+            const children = Array.from(root.children).filter((c) => c !== empty);
+            const current = children.indexOf(node);
+            if (index === undefined || index >= children.length) index = children.length - (current < 0 ? 0 : 1);
+            if (current === index) return;
+            // Moving down: the node itself no longer counts once it is taken out
+            const ref = children[current >= 0 && current < index ? index + 1 : index];
+            root.insertBefore(node, ref || null);
+        };
+
+        const remove = (uuid) => {
+            const known = items.get(uuid);
+            if (!known) return;
+            known.node.remove();
+            items.delete(uuid);
+            updateEmpty();
+        };
+
+        const snapshot = (jobs) => {
+            const keep = new Set(jobs.map((j) => j.uuid));
+            Array.from(items.keys()).filter((uuid) => !keep.has(uuid)).forEach(remove);
+            jobs.forEach((job, i) => place(nodeFor(job), i));
+            updateEmpty();
+        };
+
+        const apply = (ev) => {
+            if (!ev) return;
+            if (ev.type === "snapshot") {
+                seq = ev.seq;
+                return snapshot(Array.isArray(ev.jobs) ? ev.jobs : []);
+            }
+            if (typeof ev.seq === "number" && ev.seq < seq) return;
+            seq = ev.seq;
+
+            switch (ev.type) {
+                case "add":
+                    place(nodeFor(ev.job), ev.index);
+                    break;
+                case "update":
+                    if (items.has(ev.uuid)) nodeFor(ev.job);
+                    break;
+                case "move":
+                    if (items.has(ev.uuid)) place(items.get(ev.uuid).node, ev.index);
+                    break;
+                case "remove":
+                    remove(ev.uuid);
+                    break;
             }
+            updateEmpty();
         };
-        es.onerror = () => es.close();
-        return () => es.close();
+
+        updateEmpty();
+        return {apply, remove};
     };
 
     document.addEventListener("DOMContentLoaded", () => {
-        const stopUnlisted = connectSSE("/api/queues/unlisted", (list) => renderList(list, "#unlisted-list", "unlisted", "No unlisted jobs"));
-        const stopQueue = connectSSE("/api/queues/queue", (list) => renderList(list, "#queue-list", "queue", "Queue is empty"));
-        window.addEventListener("beforeunload", () => {
-            stopUnlisted();
-            stopQueue();
-        });
+        const unlisted = JobList("#unlisted-list", "unlisted", "No unlisted jobs");
+        const queue = JobList("#queue-list", "queue", "Queue is empty");
+        if (unlisted) App.stream.on("unlisted", unlisted.apply);
+        if (queue) App.stream.on("queue", queue.apply);
 
         const unlistedRoot = document.querySelector("#unlisted-list");
         if (unlistedRoot) {
@@ -96,8 +156,7 @@
                         throw new Error(data.error || `HTTP ${res.status}`);
                     }
 
-                    const item = btn.closest(".unlisted-item");
-                    if (item) item.remove();
+                    unlisted.remove(uuid);
 
                 } catch (err) {
                     console.error("Failed to move job to queue:", err);